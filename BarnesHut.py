@@ -0,0 +1,306 @@
+#!/usr/bin/python3
+
+import numpy as np
+from ParticleSystem import ATTRACTION
+
+
+def interleave(values):
+    """spread the lower 16 bits of values to the even bits of the result"""
+    values = values.astype(np.uint64) & np.uint64(0xffff)
+    values = (values | (values << np.uint64(8))) & np.uint64(0x00ff00ff)
+    values = (values | (values << np.uint64(4))) & np.uint64(0x0f0f0f0f)
+    values = (values | (values << np.uint64(2))) & np.uint64(0x33333333)
+    values = (values | (values << np.uint64(1))) & np.uint64(0x55555555)
+    return values
+
+
+def get_ranges(starts, stops):
+    """
+    return all indices of the ranges [start, stop) concatenated
+    and the position of every range in the result
+    """
+    number = stops - starts
+    firsts = np.cumsum(number) - number
+    indices = np.arange(number.sum()) + np.repeat(starts - firsts, number)
+    return (indices, firsts)
+
+
+class BarnesHut(object):
+    """
+    quadtree force solver for particles of several kinds
+
+    every particle is pulled towards (or pushed away from) every other
+    particle with the coefficient of the kind pair from attraction,
+    the force falls off with the square of the distance.
+    far away groups of particles are replaced by the centroid of every
+    kind in their quadtree node, so summing all forces takes
+    O(n log n) instead of O(n^2).
+
+    particles are sorted along a z-order curve, so every node is a
+    contiguous range of sorted particles. nodes are split until they
+    hold at most leaf_size particles. the traversal walks pairs of
+    target and source nodes, a far source acts on the whole target
+    node at once, its field and gradient are passed down to the leaves.
+    near leaves are summed particle by particle.
+    tree and traversal are built with array operations, level by level,
+    for all pairs at once
+    """
+
+    def __init__(self, attraction=ATTRACTION, theta=1.0, softening=1.0, leaf_size=8, depth=16):
+        """
+        (np.ndarray) attraction - (kinds, kinds) coefficient matrix
+        (float) theta - opening angle, a source node acts on a target
+            node as a whole if (source size + target radius) / distance
+            < theta, 0 gives the exact sum, higher values are faster and
+            less exact, 1 is about 1% off the exact sum
+        (float) softening - added to distances, to avoid infinite
+            forces of very near particles
+        (int) leaf_size - nodes with at most that many particles
+            are not split further
+        (int) depth - maximum number of quadtree levels below root,
+            at most 16, deeper nodes are leaves of any size
+        """
+        self.attraction = np.asarray(attraction, dtype=np.float64)
+        self.theta = theta
+        self.softening = softening
+        self.leaf_size = leaf_size
+        self.depth = min(depth, 16)
+
+    def build(self, positions, kinds):
+        """
+        build quadtree over positions
+        returns dict of particle order along the z-order curve, sorted
+        positions and kinds and node arrays, range of sorted particles,
+        level, size, leaf flag, parent and range of children of every
+        node, particle counts and centroids per kind, centroid of all
+        particles and radius around it
+        """
+        nkinds = len(self.attraction)
+        low = positions.min(axis=0)
+        size = max((positions.max(axis=0) - low).max(), 1e-9) * (1.0 + 1e-9)
+        cells = 1 << self.depth
+        grid = np.minimum(((positions - low) / size * cells).astype(np.int64), cells - 1)
+        codes = (interleave(grid[:, 0]) | (interleave(grid[:, 1]) << np.uint64(1))).astype(np.int64)
+        order = np.argsort(codes, kind="stable")
+        codes = codes[order]
+        # nodes of the current level, the root holds all particles
+        starts = np.zeros(1, dtype=np.intp)
+        stops = np.array([len(codes)], dtype=np.intp)
+        levels = []
+        # index of the first node of the current level
+        offset = 0
+        for level in range(self.depth + 1):
+            split = (stops - starts > self.leaf_size) & (level < self.depth)
+            child_start = np.zeros(len(starts), dtype=np.intp)
+            child_stop = np.zeros(len(starts), dtype=np.intp)
+            levels.append((starts, stops, np.full(len(starts), level), ~split, child_start, child_stop))
+            if not split.any():
+                break
+            # children are the runs of equal key prefix in split nodes
+            (indices, firsts) = get_ranges(starts[split], stops[split])
+            prefixes = codes[indices] >> (2 * (self.depth - level - 1))
+            first = np.ones(len(indices), dtype=bool)
+            first[1:] = prefixes[1:] != prefixes[:-1]
+            first[firsts] = True
+            runs = np.flatnonzero(first)
+            parents = np.flatnonzero(split)[np.searchsorted(firsts, runs, side="right") - 1]
+            offset += len(starts)
+            child_start[:] = offset + np.searchsorted(parents, np.arange(len(starts)), side="left")
+            child_stop[:] = offset + np.searchsorted(parents, np.arange(len(starts)), side="right")
+            starts = indices[runs]
+            stops = indices[np.append(runs[1:], len(indices)) - 1] + 1
+        (starts, stops, levels, leaf, child_start, child_stop) = [np.concatenate(column) for column in zip(*levels)]
+        positions = positions[order]
+        kinds = kinds[order]
+        # sums over a range of sorted particles are differences of
+        # cumulative sums, relative to low to keep them small
+        counts = np.zeros((nkinds, len(starts)), dtype=np.float64)
+        sums_x = np.zeros((nkinds, len(starts)), dtype=np.float64)
+        sums_y = np.zeros((nkinds, len(starts)), dtype=np.float64)
+        cumulative = np.zeros(len(positions) + 1, dtype=np.float64)
+        for kind in range(nkinds):
+            member = kinds == kind
+            for (sums, values) in ((counts, member), (sums_x, member * (positions[:, 0] - low[0])), (sums_y, member * (positions[:, 1] - low[1]))):
+                np.cumsum(values, out=cumulative[1:])
+                sums[kind] = cumulative[stops] - cumulative[starts]
+        total = stops - starts
+        center_x = sums_x.sum(axis=0) / total + low[0]
+        center_y = sums_y.sum(axis=0) / total + low[1]
+        # largest distance of a particle to the centroid of its node
+        (indices, firsts) = get_ranges(starts, stops)
+        owners = np.repeat(np.arange(len(starts)), total)
+        distances = np.hypot(positions[indices, 0] - center_x[owners], positions[indices, 1] - center_y[owners])
+        # children follow their parents in order, the root has none
+        parent = np.zeros(len(starts), dtype=np.intp)
+        parent[1:] = np.repeat(np.arange(len(starts)), child_stop - child_start)
+        divisor = np.where(counts > 0, counts, 1.0)
+        return {
+            "order" : order,
+            "positions" : positions,
+            "kinds" : kinds,
+            "start" : starts,
+            "stop" : stops,
+            "level" : levels,
+            "size" : size / 2.0 ** levels,
+            "parent" : parent,
+            "leaf" : leaf,
+            "child_start" : child_start,
+            "child_stop" : child_stop,
+            "counts" : counts,
+            "centers_x" : sums_x / divisor + low[0],
+            "centers_y" : sums_y / divisor + low[1],
+            "center_x" : center_x,
+            "center_y" : center_y,
+            "radius" : np.maximum.reduceat(distances, firsts),
+        }
+
+    def get_forces(self, positions, kinds):
+        """
+        return (n, 2) summed forces on all particles
+
+        (np.ndarray) positions - (n, 2) positions
+        (np.ndarray) kinds - (n, ) kind index of every particle
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+        kinds = np.asarray(kinds, dtype=np.intp)
+        forces = np.zeros_like(positions)
+        if len(positions) < 2:
+            return forces
+        tree = self.build(positions, kinds)
+        # pairs of target and source node still to look at, start with root
+        targets = np.zeros(1, dtype=np.intp)
+        nodes = np.zeros(1, dtype=np.intp)
+        far_pairs = []
+        near_pairs = []
+        while len(targets) > 0:
+            # nodes holding the same particles are never used as a whole
+            overlap = (tree["start"][nodes] < tree["stop"][targets]) & (tree["start"][targets] < tree["stop"][nodes])
+            distance = np.hypot(tree["center_x"][nodes] - tree["center_x"][targets], tree["center_y"][nodes] - tree["center_y"][targets])
+            far = ~overlap & (tree["size"][nodes] + tree["radius"][targets] < self.theta * distance)
+            near = ~far & tree["leaf"][targets] & tree["leaf"][nodes]
+            far_pairs.append((targets[far], nodes[far]))
+            near_pairs.append((targets[near], nodes[near]))
+            # open the larger node of all other pairs, the target if
+            # both are on the same level
+            opened = ~(far | near)
+            targets = targets[opened]
+            nodes = nodes[opened]
+            split = ~tree["leaf"][targets] & (tree["leaf"][nodes] | (tree["level"][targets] <= tree["level"][nodes]))
+            opening = np.where(split, targets, nodes)
+            number = tree["child_stop"][opening] - tree["child_start"][opening]
+            (children, _) = get_ranges(tree["child_start"][opening], tree["child_stop"][opening])
+            keeping = np.repeat(np.where(split, nodes, targets), number)
+            split = np.repeat(split, number)
+            (targets, nodes) = (np.where(split, children, keeping), np.where(split, keeping, children))
+        (targets, nodes) = [np.concatenate(column) for column in zip(*far_pairs)]
+        self.accumulate_far(forces, tree, targets, nodes)
+        (targets, nodes) = [np.concatenate(column) for column in zip(*near_pairs)]
+        self.accumulate_near(forces, tree, targets, nodes)
+        return forces
+
+    def accumulate_far(self, forces, tree, targets, nodes):
+        """
+        add forces of the per kind centroids of far source nodes to all
+        particles of the target nodes, the field of every kind and its
+        gradient are summed once per target node at its centroid, passed
+        down to the leaves and extrapolated to the particles
+
+        (np.ndarray) forces - (n, 2) to add to, in original order
+        (dict) tree - quadtree from build
+        (np.ndarray) targets - (m, ) target node index of every pair
+        (np.ndarray) nodes - (m, ) source node index of every pair
+        """
+        nkinds = len(self.attraction)
+        length = len(tree["start"])
+        x = tree["center_x"][targets]
+        y = tree["center_y"][targets]
+        # (kinds, nodes) field of every kind at every target node and
+        # its derivatives, the gradient is symmetric
+        field_x = np.zeros((nkinds, length), dtype=np.float64)
+        field_y = np.zeros((nkinds, length), dtype=np.float64)
+        field_xx = np.zeros((nkinds, length), dtype=np.float64)
+        field_xy = np.zeros((nkinds, length), dtype=np.float64)
+        field_yy = np.zeros((nkinds, length), dtype=np.float64)
+        for kind in range(nkinds):
+            direction_x = tree["centers_x"][kind][nodes] - x
+            direction_y = tree["centers_y"][kind][nodes] - y
+            distance2 = direction_x ** 2 + direction_y ** 2 + self.softening ** 2
+            weights = tree["counts"][kind][nodes] / (distance2 * np.sqrt(distance2))
+            field_x[kind] = np.bincount(targets, direction_x * weights, length)
+            field_y[kind] = np.bincount(targets, direction_y * weights, length)
+            diagonal = np.bincount(targets, weights, length)
+            weights *= 3.0 / distance2
+            field_xx[kind] = np.bincount(targets, direction_x * direction_x * weights, length) - diagonal
+            field_xy[kind] = np.bincount(targets, direction_x * direction_y * weights, length)
+            field_yy[kind] = np.bincount(targets, direction_y * direction_y * weights, length) - diagonal
+        # pass down level by level, nodes of a level are contiguous
+        bounds = np.searchsorted(tree["level"], np.arange(tree["level"][-1] + 2))
+        for (start, stop) in zip(bounds[1:-1], bounds[2:]):
+            parents = tree["parent"][start:stop]
+            offset_x = tree["center_x"][start:stop] - tree["center_x"][parents]
+            offset_y = tree["center_y"][start:stop] - tree["center_y"][parents]
+            field_x[:, start:stop] += field_x[:, parents] + field_xx[:, parents] * offset_x + field_xy[:, parents] * offset_y
+            field_y[:, start:stop] += field_y[:, parents] + field_xy[:, parents] * offset_x + field_yy[:, parents] * offset_y
+            field_xx[:, start:stop] += field_xx[:, parents]
+            field_xy[:, start:stop] += field_xy[:, parents]
+            field_yy[:, start:stop] += field_yy[:, parents]
+        # leaf of every sorted particle and offset to its centroid
+        leaves = np.flatnonzero(tree["leaf"])
+        (indices, _) = get_ranges(tree["start"][leaves], tree["stop"][leaves])
+        owners = np.empty(len(indices), dtype=np.intp)
+        owners[indices] = np.repeat(leaves, tree["stop"][leaves] - tree["start"][leaves])
+        offset_x = tree["positions"][:, 0] - tree["center_x"][owners]
+        offset_y = tree["positions"][:, 1] - tree["center_y"][owners]
+        force_x = np.zeros(len(owners), dtype=np.float64)
+        force_y = np.zeros(len(owners), dtype=np.float64)
+        for kind in range(nkinds):
+            coefficients = self.attraction[tree["kinds"], kind]
+            force_x += coefficients * (field_x[kind][owners] + field_xx[kind][owners] * offset_x + field_xy[kind][owners] * offset_y)
+            force_y += coefficients * (field_y[kind][owners] + field_xy[kind][owners] * offset_x + field_yy[kind][owners] * offset_y)
+        forces[tree["order"], 0] += force_x
+        forces[tree["order"], 1] += force_y
+
+    def accumulate_near(self, forces, tree, targets, nodes):
+        """
+        add forces of every single particle in near leaves to all
+        particles of the target leaves, so theta 0 gives the exact sum
+
+        (np.ndarray) forces - (n, 2) to add to, in original order
+        (dict) tree - quadtree from build
+        (np.ndarray) targets - (m, ) leaf index of every pair
+        (np.ndarray) nodes - (m, ) leaf index of every pair
+        """
+        # one row per particle of the target leaf and near leaf,
+        # then one row per particle of the near leaf
+        (particles, _) = get_ranges(tree["start"][targets], tree["stop"][targets])
+        nodes = np.repeat(nodes, tree["stop"][targets] - tree["start"][targets])
+        number = tree["stop"][nodes] - tree["start"][nodes]
+        (others, _) = get_ranges(tree["start"][nodes], tree["stop"][nodes])
+        particles = np.repeat(particles, number)
+        if self.softening == 0:
+            # with softening the particle itself adds a zero force
+            other = particles != others
+            particles = particles[other]
+            others = others[other]
+        x = tree["positions"][:, 0]
+        y = tree["positions"][:, 1]
+        direction_x = x[others] - x[particles]
+        direction_y = y[others] - y[particles]
+        distance2 = direction_x ** 2 + direction_y ** 2 + self.softening ** 2
+        kinds = tree["kinds"]
+        weights = self.attraction.ravel()[kinds[particles] * len(self.attraction) + kinds[others]] / (distance2 * np.sqrt(distance2))
+        forces[tree["order"], 0] += np.bincount(particles, direction_x * weights, len(forces))
+        forces[tree["order"], 1] += np.bincount(particles, direction_y * weights, len(forces))
+
+    def get_forces_exact(self, positions, kinds):
+        """
+        return (n, 2) summed forces by summing over all pairs,
+        O(n^2) memory and time, to check the approximation
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+        kinds = np.asarray(kinds, dtype=np.intp)
+        directions = positions[np.newaxis, :, :] - positions[:, np.newaxis, :]
+        distance2 = (directions ** 2).sum(axis=2) + self.softening ** 2
+        weights = self.attraction[kinds[:, np.newaxis], kinds[np.newaxis, :]] / (distance2 * np.sqrt(distance2))
+        np.fill_diagonal(weights, 0.0)
+        return (directions * weights[:, :, np.newaxis]).sum(axis=1)
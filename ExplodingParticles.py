@@ -2,12 +2,17 @@
 
 import sys
 import pygame
-import random
 import cProfile
 import time
 import numpy
 # own modules
 from Vec2dFast import Vec2d
+from SpatialGrid import SpatialGrid
+from ParticleSystem import ParticleSystem
+from BarnesHut import BarnesHut
+from Scheduler import Scheduler
+import RandomStream
+import FontCache
 #from Vec3d import Vec3d
 
 
@@ -21,7 +26,7 @@ class Thing(object):
         self.universe = universe
         self.position = pos2d
         # define some additional variables
-        self.direction = Vec2d(random.random(), random.random())
+        self.direction = Vec2d(universe.rng.random(), universe.rng.random())
         self.color = pygame.Color(128, 128, 128, 255)
         self.next_direction = self.direction
         self.next_position = None
@@ -39,31 +44,22 @@ class Thing(object):
         self.check_boundaries() # inside visible area
         if not self.check_reserved(): # is the new position already used
             self.position = self.next_position
+            self.universe.grid.update(self)
         self.direction = self.next_direction
+
+    def draw(self):
+        """plot thing at its current position"""
         self.surface.set_at((int(self.position.x), int(self.position.y)), self.color)
 
     def get_nearest_thing(self):
-        min_dist = None
-        nearest_thing = None
-        for other_thing in self.universe.things:
-            if other_thing == self:
-                continue
-            direction = other_thing.get_direction_to(self)
-            distance = direction.length
-            if (min_dist is None) or (min_dist > distance):
-                nearest_thing = other_thing
-                min_dist = distance
-        return nearest_thing
+        return self.universe.grid.nearest(self.position, exclude=self)
 
     def check_reserved(self):
         """
         check if on new position there is some other element
         if yes, stop
         """
-        if self.surface.get_at((int(self.next_position.x), int(self.next_position.y))) != self.universe.empty:
-        #if new_position in self.universe.positions:
-            return True
-        return False
+        return self.universe.grid.is_occupied(self.next_position, exclude=self)
 
     def check_boundaries(self):
         """
@@ -154,25 +150,40 @@ class Universe(object):
     kinds = (Proton, Electron, Neutron)
     #kinds = (Proton, )
 
-    def __init__(self, surface, number, speed=0.01):
+    def __init__(self, surface, number, speed=0.01, vectorized=True, strength=0.0, solver=None, rng=None):
         """
         surface = pygame.Surface
         stars - amount of strar to create
         depth - z axis depth from 0 to 0+depth
         speed - how fast should stars travel
+        vectorized - move all particles with one ParticleSystem
+            instead of one Thing object per particle
+        strength - weight of attraction in vectorized universe
+        solver - force solver for vectorized universe, like BarnesHut
+        rng - RandomStream for kinds and directions,
+            stream ExplodingParticles if not given
         """
         self.surface = surface
+        if rng is None:
+            rng = RandomStream.get_stream("ExplodingParticles")
+        self.rng = rng
         self.number = number
         self.speed = speed
+        self.vectorized = vectorized
+        self.engine = None
+        self.strength = strength
+        self.solver = solver
         # set initial variables
         self.color = pygame.Color(255, 255, 255, 255)
         self.empty = pygame.Color(0, 0, 0, 255) # indicates empty place
         # initialize array
         self.things = []
         self.positions = []
+        # spatial index of things for neighbour and collision queries
+        self.grid = SpatialGrid(cell_size=8)
         # initial text surface to get points from
-        self.font = pygame.font.SysFont("mono", 20, bold=True)
-        self.text_surface = self.font.render("AM", True, self.color)
+        self.font = FontCache.get_font("mono", 20, True)
+        self.text_surface = FontCache.render("mono", 20, True, "AM", self.color)
         self.number = self.text_surface.get_width() * self.text_surface.get_height()
         print "There are %d points in Textsurface" % self.number
         self.timestamp = 1
@@ -180,7 +191,10 @@ class Universe(object):
         self.lasttime = None
         self.timescale = None
         # initialize universe
-        self.generate()
+        if self.vectorized:
+            self.generate_vectorized()
+        else:
+            self.generate()
 
     def generate(self):
         zoom = Vec2d(10, 10)
@@ -191,33 +205,85 @@ class Universe(object):
                 color = self.text_surface.get_at((x, y))
                 if color != pygame.Color(255, 255, 255, 0):
                     print "Found non-black color %s at %s x %s" % (color, x, y)
-                    kind = int(random.random() * len(self.kinds))
+                    kind = self.rng.randint(0, len(self.kinds))
                     pos2d = Vec2d(x, y) * zoom + pan
                     new_thing = self.kinds[kind](self.surface, self, pos2d, self.color)
-                    self.things.append(self.kinds[kind](self.surface, self, pos2d, self.color))
+                    self.things.append(new_thing)
                     self.positions.append(new_thing.position)
+                    self.grid.insert(new_thing)
         print "Placed %d things in universe" % len(self.things)
         self.lasttime = time.time()
 
+    def generate_vectorized(self):
+        """
+        same start positions as generate, but all particles
+        live in one ParticleSystem
+        """
+        zoom = numpy.array((10, 10))
+        pan = numpy.array((200, 100))
+        # every pixel with some alpha is part of the text
+        alpha = pygame.surfarray.array_alpha(self.text_surface)
+        positions = numpy.argwhere(alpha > 0) * zoom + pan
+        kinds = self.rng.randint(0, len(self.kinds), len(positions))
+        self.engine = ParticleSystem(self.surface, positions, kinds, strength=self.strength, solver=self.solver, rng=self.rng)
+        print "Placed %d things in universe" % len(self.engine)
+        self.lasttime = time.time()
+
     def update(self, fov=2, viewer_distance=256):
         """update every frame"""
         duration = time.time() - self.lasttime
         self.timescale = self.fps / duration
         #print "Duration %f fps should %f Timescale %f" % (duration, self.fps, self.timescale)
         #parray = pygame.surfarray.pixels2d(surface)
+        if self.engine is not None:
+            self.engine.update(self.timescale)
         for thing in self.things:
             thing.update()
+            thing.draw()
         self.timestamp += 1
         self.lasttime = time.time()
 
-def main():
-    """test"""
+    def step(self, dt):
+        """
+        simulate dt seconds, independent of frame rate,
+        to be used as simulate of Scheduler
+        at 1/fps seconds every particle moves one pixel
+        """
+        self.timescale = dt / self.fps
+        if self.engine is not None:
+            self.engine.step(self.timescale)
+        for thing in self.things:
+            thing.update()
+        self.timestamp += 1
+
+    def draw(self, alpha=1.0):
+        """
+        draw particles between last and current step,
+        to be used as render of Scheduler
+        """
+        if self.engine is not None:
+            self.engine.draw(alpha)
+        # things are drawn at their last position, not interpolated
+        for thing in self.things:
+            thing.draw()
+
+def main(solver=None):
+    """
+    test
+    (object) solver - force solver like BarnesHut, particles
+        attract each other only if given
+    """
     try:
         fps = 255
         surface = pygame.display.set_mode((600, 600))
         pygame.init()
         # create universe
-        universe = Universe(surface, number=50, speed=0.01)
+        if solver is None:
+            universe = Universe(surface, number=50, speed=0.01)
+        else:
+            universe = Universe(surface, number=50, speed=0.01, strength=0.1, solver=solver)
+        # simulation runs with fixed steps, whatever fps is reached
+        scheduler = Scheduler(universe.step, universe.draw, dt=universe.fps)
         clock = pygame.time.Clock()
         # for 3d projection
         fov = 1
@@ -251,16 +317,26 @@ def main():
                     fov = 2
             if pause is not True:
                 surface.fill((0, 0, 0, 255))
-                universe.update(viewer_distance=viewer_distance, fov=fov)
+                scheduler.frame()
                 pygame.display.flip()
+            else:
+                # no catching up for paused time
+                scheduler.reset()
             if time.time() > max_running_time:
                 break
         print "Last observed universe timestamp %d" % universe.timestamp
         print "Took %f seconds" % (time.time() - starttime)
-        print "Took %f per frame at %f fps" % ((time.time() - starttime) / universe.timestamp, universe.timestamp/(time.time() - starttime))
+        if scheduler.frames > 0:
+            print "Took %f per frame at %f fps" % ((time.time() - starttime) / scheduler.frames, scheduler.frames / (time.time() - starttime))
+        for (stage, stats) in sorted(scheduler.get_stats().items()):
+            print "%s mean %f max %f" % (stage, stats["mean"], stats["max"])
     except KeyboardInterrupt:
         print 'shutting down'
 
 if __name__ == "__main__":
-    cProfile.run("main()")
+    # --barnes-hut lets particles attract each other
+    if "--barnes-hut" in sys.argv[1:]:
+        cProfile.run("main(BarnesHut())")
+    else:
+        cProfile.run("main()")
     #main()
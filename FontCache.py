@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+
+import os
+import collections
+import pygame
+
+
+# (face, size, bold) -> pygame.font.Font, fonts are never evicted,
+# there are only a few of them and SysFont scans all system fonts
+fonts = {}
+# faces ending like this are font files, not system font names
+FONT_EXTENSIONS = (".ttf", ".otf", ".fon")
+# (face, size, bold, text, color, antialias) -> rendered surface,
+# least recently used surfaces are evicted if the limit in bytes is reached
+surfaces = collections.OrderedDict()
+surfaces_limit = 8 * 1024 * 1024
+# memory of all cached surfaces in bytes
+surfaces_nbytes = 0
+
+
+def get_font(face, size, bold=False):
+    """
+    return font, loaded on first use and shared by all callers
+
+    (str) face - path of a font file, system font name
+        or None for the pygame default font, names ending
+        like font files are always loaded as files, so a
+        missing file raises an error
+    (int) size - size of font
+    (bool) bold - bold font
+    """
+    key = (face, size, bold)
+    if key not in fonts:
+        if face is None or face.lower().endswith(FONT_EXTENSIONS) or os.path.isfile(face):
+            font = pygame.font.Font(face, size)
+            font.set_bold(bold)
+        else:
+            font = pygame.font.SysFont(face, size, bold=bold)
+        fonts[key] = font
+    return(fonts[key])
+
+
+def get_nbytes(surface):
+    """memory of surface pixels in bytes"""
+    return(surface.get_pitch() * surface.get_height())
+
+
+def set_limit(limit):
+    """set maximum size of rendered text cache in bytes"""
+    global surfaces_limit
+    surfaces_limit = limit
+    evict()
+
+
+def evict():
+    """drop least recently used surfaces until cache fits in limit"""
+    global surfaces_nbytes
+    while surfaces_nbytes > surfaces_limit and len(surfaces) > 0:
+        (_, surface) = surfaces.popitem(last=False)
+        surfaces_nbytes -= get_nbytes(surface)
+
+
+def render(face, size, bold, text, color, antialias=True):
+    """
+    cached version of font.render, the same text in the same font
+    and color is rendered only once.
+    the returned surface is shared, so do not draw on it
+
+    (str) face - font face, like in get_font
+    (int) size - size of font
+    (bool) bold - bold font
+    (str) text - text to render
+    (pygame.Color) color - color of text, also tuple
+    (bool) antialias - smooth edges
+    """
+    global surfaces_nbytes
+    # pygame.Color is not hashable, rgb and rgba of the same color
+    # should find the same surface
+    rgba = tuple(color)
+    if len(rgba) == 3:
+        rgba += (255,)
+    key = (face, size, bold, text, rgba, antialias)
+    surface = surfaces.pop(key, None)
+    if surface is None:
+        surface = get_font(face, size, bold).render(text, antialias, color)
+        surfaces_nbytes += get_nbytes(surface)
+    # most recently used at the end
+    surfaces[key] = surface
+    evict()
+    return(surface)
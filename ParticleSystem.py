@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+
+import pygame
+import numpy as np
+import RandomStream
+
+# kinds of particles, index into coefficient matrices
+PROTON = 0
+ELECTRON = 1
+NEUTRON = 2
+KINDS = ("Proton", "Electron", "Neutron")
+COLORS = (
+    pygame.Color(0, 255, 0, 255),
+    pygame.Color(255, 0, 0, 255),
+    pygame.Color(0, 0, 255, 255),
+)
+# ATTRACTION[kind, other_kind] is the factor for direction to other,
+# +1 moves towards other, -1 away from other, 0 ignores other
+# these are the get_direction_to rules of ExplodingParticles
+ATTRACTION = np.array((
+    # Proton Electron Neutron
+    ( 1, -1, -1), # Proton
+    (-1,  1,  0), # Electron
+    ( 1,  1, -1), # Neutron
+    ), dtype=np.float64)
+
+
+class ParticleSystem(object):
+    """
+    particles stored as arrays of positions, directions and kinds,
+    every frame is calculated with array operations for all particles
+    """
+
+    def __init__(self, surface, positions, kinds, attraction=ATTRACTION, colors=COLORS, strength=0.0, solver=None, rng=None):
+        """
+        (pygame.Surface) surface - surface to draw on
+        (np.ndarray) positions - (n, 2) start positions
+        (np.ndarray) kinds - (n, ) kind index of every particle
+        (np.ndarray) attraction - (kinds, kinds) coefficient matrix
+        (tuple) colors - pygame.Color for every kind
+        (float) strength - weight of attraction against current direction,
+            0 lets particles move straight
+        (object) solver - force solver with get_forces(positions, kinds),
+            like BarnesHut, None uses the linear attraction of all
+            particles
+        (RandomStream) rng - source of random start directions,
+            stream ParticleSystem if not given
+        """
+        self.surface = surface
+        if rng is None:
+            rng = RandomStream.get_stream("ParticleSystem")
+        # keep all particles on surface
+        self.positions = np.clip(np.array(positions, dtype=np.float64), 0, (surface.get_width() - 1, surface.get_height() - 1))
+        self.kinds = np.asarray(kinds, dtype=np.intp)
+        self.attraction = np.asarray(attraction, dtype=np.float64)
+        self.strength = strength
+        self.solver = solver
+        self.directions = rng.random(self.positions.shape)
+        # positions before last step, for interpolated drawing
+        self.previous = self.positions.copy()
+        # pixel value of every kind, mapped once
+        self.colors = np.array([surface.map_rgb(color) for color in colors], dtype=np.uint32)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def get_forces(self):
+        """
+        sum of direction vectors to all other particles, weighted by
+        attraction coefficient of kind pair
+
+        direction vectors are not normalized, so the sum over all
+        particles of one kind is count * (centroid - position),
+        this needs only one sum per kind, not one per pair
+
+        if a solver is set, its forces are used instead
+        """
+        if self.solver is not None:
+            return self.solver.get_forces(self.positions, self.kinds)
+        kinds = len(self.attraction)
+        counts = np.bincount(self.kinds, minlength=kinds).astype(np.float64)
+        sums = np.zeros((kinds, 2), dtype=np.float64)
+        np.add.at(sums, self.kinds, self.positions)
+        # (n, kinds) coefficients of every particle to every kind
+        coefficients = self.attraction[self.kinds]
+        # a particle is no neighbour of itself, its own term is 0 anyway
+        return coefficients.dot(sums) - coefficients.dot(counts)[:, np.newaxis] * self.positions
+
+    def update(self, timescale=1.0):
+        """move all particles one step and draw them"""
+        self.step(timescale)
+        self.draw()
+
+    def step(self, timescale=1.0):
+        """move all particles one step, without drawing"""
+        width = self.surface.get_width()
+        height = self.surface.get_height()
+        self.previous = self.positions.copy()
+        if self.strength > 0.0:
+            self.directions += self.strength * self.normalized(self.get_forces())
+        # multiply by timescaler, to get fast movement also on slow
+        # computers
+        self.directions = self.normalized(self.directions) * timescale
+        next_positions = self.positions + self.directions
+        # reflect on borders of visible area
+        outside = (next_positions <= 0) | (next_positions >= (width, height))
+        self.directions[outside] *= -1
+        next_positions[outside] = self.positions[outside]
+        # particles stay, if another particle is on their new pixel
+        pixels = self.positions.astype(np.intp)
+        next_pixels = next_positions.astype(np.intp)
+        index = pixels[:, 0] * height + pixels[:, 1]
+        next_index = next_pixels[:, 0] * height + next_pixels[:, 1]
+        occupied = np.bincount(index, minlength=width * height)[next_index] - (next_index == index)
+        moving = occupied == 0
+        self.positions[moving] = next_positions[moving]
+
+    def draw(self, alpha=1.0):
+        """
+        plot all particles with one scatter
+        alpha between 0.0 and 1.0 draws particles interpolated
+        between position before and after the last step
+        """
+        if alpha < 1.0:
+            positions = self.previous + (self.positions - self.previous) * alpha
+        else:
+            positions = self.positions
+        pixels = positions.astype(np.intp)
+        pixel2d = pygame.surfarray.pixels2d(self.surface)
+        pixel2d[pixels[:, 0], pixels[:, 1]] = self.colors[self.kinds]
+        del pixel2d
+
+    @staticmethod
+    def normalized(vectors):
+        """return (n, 2) vectors with length 1, zero vectors stay zero"""
+        lengths = np.hypot(vectors[:, 0], vectors[:, 1])
+        lengths[lengths == 0] = 1.0
+        return vectors / lengths[:, np.newaxis]
@@ -0,0 +1,97 @@
+#!/usr/bin/python3
+
+import zlib
+import numpy as np
+
+
+class RandomStream(object):
+    """
+    seeded source of random numbers for one effect
+
+    numbers come from its own numpy RandomState, so the same seed
+    gives the same numbers in the same order, independent of other
+    effects and of the global random module.
+    arrays are drawn in one call, single numbers are handed out
+    from a block drawn in advance, to be cheap in python loops
+    """
+
+    def __init__(self, seed=None, block=4096):
+        """
+        (int) seed - start value, None for a different sequence every run
+        (int) block - number of single values drawn at once
+        """
+        self.seed = seed
+        self.block = block
+        self.state = None
+        self.values = None
+        self.index = 0
+        self.reset()
+
+    def reset(self, seed=None):
+        """
+        start sequence again from the beginning,
+        with new seed if given
+        """
+        if seed is not None:
+            self.seed = seed
+        self.state = np.random.RandomState(self.seed)
+        self.values = []
+        self.index = 0
+
+    def random(self, size=None):
+        """
+        return float in 0.0 - 1.0 (exclusive), or array of
+        such floats in shape size
+        """
+        if size is not None:
+            return(self.state.random_sample(size))
+        if self.index == len(self.values):
+            self.values = self.state.random_sample(self.block).tolist()
+            self.index = 0
+        self.index += 1
+        return(self.values[self.index - 1])
+
+    def uniform(self, low, high, size=None):
+        """float or array of floats in low - high (exclusive)"""
+        if size is not None:
+            return(self.state.uniform(low, high, size))
+        return(low + self.random() * (high - low))
+
+    def randint(self, low, high, size=None):
+        """int or array of ints in low - high (exclusive), like numpy"""
+        if size is not None:
+            return(self.state.randint(low, high, size))
+        return(low + int(self.random() * (high - low)))
+
+
+# master seed, None for not reproducible streams
+seed = None
+# name -> RandomStream, one per effect
+streams = {}
+
+
+def get_seed(name):
+    """seed of stream name, derived from master seed"""
+    if seed is None:
+        return(None)
+    return((zlib.crc32(name.encode("ascii")) ^ seed) & 0xffffffff)
+
+
+def get_stream(name):
+    """return the random stream of effect name, created on first use"""
+    if name not in streams:
+        streams[name] = RandomStream(get_seed(name))
+    return(streams[name])
+
+
+def set_seed(master_seed):
+    """
+    set master seed for all streams and start them again,
+    every stream gets its own seed derived from its name,
+    so frames can be replayed bit for bit
+    """
+    global seed
+    seed = master_seed
+    for (name, stream) in streams.items():
+        stream.seed = get_seed(name)
+        stream.reset()
@@ -0,0 +1,74 @@
+#!/usr/bin/python
+
+import timeit
+import collections
+
+
+class ResolutionController(object):
+    """
+    dynamic resolution for effects with set_scale and get_scale,
+    like Plasma, PlasmaPy, Fire and FirePy
+
+    wraps the effect, measures the time of every update call and
+    compares the recent mean to the time budget of one frame.
+    if the effect is too slow, the next coarser scale is used,
+    if the next finer scale would fit into the budget, it is used.
+    rendering cost grows with the number of pixels, so the cost of
+    another scale is estimated by the square of the scale ratio
+    """
+
+    def __init__(self, effect, fps=50, share=1.0, scales=(1, 2, 3, 4), window=25, headroom=0.8, clock=timeit.default_timer):
+        """
+        (object) effect - effect with update, set_scale and get_scale
+        (int) fps - frame rate to hold
+        (float) share - part of a frame this effect may take
+        (tuple) scales - allowed scales, from finest to coarsest
+        (int) window - number of frames to average before changing scale
+        (float) headroom - only go to a finer scale, if its estimated
+            time is lower than headroom * budget, avoids toggling
+        (function) clock - returns current time in seconds
+        """
+        self.effect = effect
+        self.budget = share / fps
+        self.scales = tuple(scales)
+        self.window = window
+        self.headroom = headroom
+        self.clock = clock
+        self.durations = collections.deque(maxlen=window)
+        # start at allowed scale nearest to current scale of effect
+        scale = effect.get_scale()
+        self.index = min(range(len(self.scales)), key=lambda index: abs(self.scales[index] - scale))
+        if self.scales[self.index] != scale:
+            self.effect.set_scale(self.scales[self.index])
+        # number of scale changes so far
+        self.changes = 0
+
+    def get_scale(self):
+        """return current scale of effect"""
+        return(self.scales[self.index])
+
+    def set_index(self, index):
+        """switch effect to scale at index of scales"""
+        self.index = index
+        self.effect.set_scale(self.scales[index])
+        self.durations.clear()
+        self.changes += 1
+
+    def adjust(self):
+        """choose scale from recent durations, called after every update"""
+        if len(self.durations) < self.window:
+            return
+        mean = sum(self.durations) / len(self.durations)
+        if mean > self.budget and self.index < len(self.scales) - 1:
+            self.set_index(self.index + 1)
+        elif self.index > 0:
+            ratio = float(self.scales[self.index]) / self.scales[self.index - 1]
+            if mean * ratio * ratio < self.headroom * self.budget:
+                self.set_index(self.index - 1)
+
+    def update(self):
+        """update effect, measure it and adjust scale"""
+        starttime = self.clock()
+        self.effect.update()
+        self.durations.append(self.clock() - starttime)
+        self.adjust()
@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+
+import timeit
+import collections
+
+
+class Scheduler(object):
+    """
+    fixed timestep loop, simulation and rendering are separated
+
+    on every frame the real time since the last frame is collected,
+    the simulation is stepped with a fixed dt as often as this time
+    allows, then rendering is called once with the fraction of dt,
+    that is left over, to interpolate between the last two steps.
+
+    so physics are the same on every machine and at every frame rate,
+    slow rendering only means fewer frames, not slower simulation
+    """
+
+    def __init__(self, simulate, render, dt=1.0 / 30.0, max_substeps=5, history=120, clock=timeit.default_timer):
+        """
+        (function) simulate - called with dt for every step
+        (function) render - called with alpha from 0.0 to 1.0, the
+            position between the last and the current step
+        (float) dt - seconds of simulated time per step
+        (int) max_substeps - at most that many steps per frame,
+            if simulation can't keep up, the rest of the time is dropped
+        (int) history - number of frames to keep timings for
+        (function) clock - returns current time in seconds
+        """
+        self.simulate = simulate
+        self.render = render
+        self.dt = dt
+        self.max_substeps = max_substeps
+        self.clock = clock
+        self.accumulator = 0.0
+        self.lasttime = None
+        # simulated steps and frames since start
+        self.steps = 0
+        self.frames = 0
+        # time dropped because simulation was too slow
+        self.dropped = 0.0
+        # stage name -> durations of the last frames in seconds
+        self.timings = {
+            "simulate" : collections.deque(maxlen=history),
+            "render" : collections.deque(maxlen=history),
+            "frame" : collections.deque(maxlen=history),
+        }
+        self.substeps = collections.deque(maxlen=history)
+
+    def reset(self):
+        """forget collected time, next frame starts without steps"""
+        self.accumulator = 0.0
+        self.lasttime = None
+
+    def frame(self):
+        """
+        step simulation as often as needed and render once
+        returns number of simulation steps done
+        """
+        starttime = self.clock()
+        if self.lasttime is not None:
+            self.accumulator += starttime - self.lasttime
+        self.lasttime = starttime
+        substeps = 0
+        while self.accumulator >= self.dt:
+            if substeps == self.max_substeps:
+                # spiral of death, simulation can't keep up,
+                # drop the rest but keep the fraction for interpolation
+                dropped = self.accumulator - self.accumulator % self.dt
+                self.dropped += dropped
+                self.accumulator -= dropped
+                break
+            self.simulate(self.dt)
+            self.accumulator -= self.dt
+            substeps += 1
+        simulated = self.clock()
+        self.render(self.accumulator / self.dt)
+        rendered = self.clock()
+        self.steps += substeps
+        self.frames += 1
+        self.substeps.append(substeps)
+        self.timings["simulate"].append(simulated - starttime)
+        self.timings["render"].append(rendered - simulated)
+        self.timings["frame"].append(rendered - starttime)
+        return(substeps)
+
+    def get_stats(self):
+        """
+        returns dict of stage name -> dict of mean and max duration
+        in milliseconds over the recent frames
+        """
+        stats = {}
+        for (stage, durations) in self.timings.items():
+            if len(durations) == 0:
+                continue
+            stats[stage] = {
+                "mean" : 1000.0 * sum(durations) / len(durations),
+                "max" : 1000.0 * max(durations),
+            }
+        if len(self.substeps) > 0:
+            stats["substeps"] = {
+                "mean" : float(sum(self.substeps)) / len(self.substeps),
+                "max" : max(self.substeps),
+            }
+        return(stats)
@@ -2,6 +2,7 @@
 
 import pygame
 import sys
+import FontCache
 
 class ScrollText(object):
     """Simple 2d Scrolling Text"""
@@ -23,8 +24,8 @@ class ScrollText(object):
         self.size = size
         # initialize
         self.position = 0
-        self.font = pygame.font.SysFont("mono", self.size, bold=True)
-        self.text_surface = self.font.render(self.text, True, self.color)
+        self.font = FontCache.get_font("mono", self.size, True)
+        self.text_surface = FontCache.render("mono", self.size, True, self.text, self.color)
 
     def update(self, hpos=None):
         """update every frame"""
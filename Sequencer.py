@@ -0,0 +1,125 @@
+#!/usr/bin/python
+
+import time
+import threading
+
+
+class Sequencer(object):
+    """
+    timeline of scenes, every scene runs one effect from start to stop
+
+    effects are built only shortly before their scene starts and
+    dropped when their scene is over, so start up time and memory
+    depend on the current scene, not on the whole demo
+
+    pygame is not thread safe, so a scene is built in two steps.
+    its optional prepare function does the expensive array work
+    without pygame, like rotation tables or heightmaps, in a
+    background thread during preload time. the factory then builds
+    the effect from the prepared arrays on the main thread, when
+    the scene starts, this is the only step touching pygame
+    """
+
+    def __init__(self, surface, scenes, preload=5, threaded=True):
+        """
+        (pygame.Surface) surface - surface to draw on
+        (list) scenes - dicts with start and stop in seconds,
+            factory, a function called with surface, which
+            returns the effect object with update method, and
+            optional prepare, a function called with the size of
+            surface, which returns a dict of keyword arguments
+            for factory, it must not call pygame
+        (int) preload - run prepare this many seconds before start
+        (bool) threaded - run prepare in background thread,
+            otherwise it runs in update call
+        """
+        self.surface = surface
+        self.scenes = sorted(scenes, key=lambda scene: scene["start"])
+        self.preload = preload
+        self.threaded = threaded
+        self.duration = max(scene["stop"] for scene in self.scenes)
+        # index of scene -> effect object, only for built scenes
+        self.effects = {}
+        # index of scene -> keyword arguments for factory
+        self.prepared = {}
+        # index of scene -> thread running prepare
+        self.loaders = {}
+        # index of scene -> exception raised in prepare
+        self.errors = {}
+        # index of scene -> seconds needed to prepare and build effect
+        self.load_durations = {}
+
+    def load(self, index):
+        """run prepare of scene, without pygame calls"""
+        scene = self.scenes[index]
+        try:
+            starttime = time.time()
+            if "prepare" in scene:
+                self.prepared[index] = scene["prepare"](self.surface.get_size())
+            else:
+                self.prepared[index] = {}
+            self.load_durations[index] = time.time() - starttime
+        except Exception as exc:
+            if not self.threaded:
+                raise
+            self.errors[index] = exc
+
+    def prepare(self, index):
+        """start prepare of scene, if not already done"""
+        if (index in self.effects) or (index in self.prepared) or (index in self.loaders):
+            return
+        if self.threaded:
+            loader = threading.Thread(target=self.load, args=(index, ))
+            loader.daemon = True
+            self.loaders[index] = loader
+            loader.start()
+        else:
+            self.load(index)
+
+    def get_effect(self, index):
+        """
+        return effect of scene, built on first call,
+        waits for prepare, if it is not ready
+        """
+        if index not in self.effects:
+            if index in self.loaders:
+                self.loaders.pop(index).join()
+            elif index not in self.prepared:
+                self.load(index)
+            if index in self.errors:
+                raise self.errors.pop(index)
+            starttime = time.time()
+            self.effects[index] = self.scenes[index]["factory"](self.surface, **self.prepared.pop(index))
+            self.load_durations[index] = self.load_durations.get(index, 0.0) + time.time() - starttime
+        return(self.effects[index])
+
+    def teardown(self, index):
+        """drop effect of finished scene"""
+        if index in self.loaders:
+            self.loaders.pop(index).join()
+        self.effects.pop(index, None)
+        self.prepared.pop(index, None)
+        self.errors.pop(index, None)
+
+    def update(self, runtime):
+        """
+        update effects of all scenes with start < runtime < stop,
+        prepare upcoming and drop finished scenes
+        returns False if all scenes are over
+        """
+        for (index, scene) in enumerate(self.scenes):
+            if runtime >= scene["stop"]:
+                if (index in self.effects) or (index in self.prepared) or (index in self.loaders):
+                    self.teardown(index)
+            elif scene["start"] < runtime:
+                self.get_effect(index).update()
+            elif scene["start"] - self.preload <= runtime:
+                self.prepare(index)
+        return(runtime < self.duration)
+
+    def close(self):
+        """wait for running loaders and drop all effects"""
+        for index in list(self.loaders):
+            self.teardown(index)
+        self.effects.clear()
+        self.prepared.clear()
@@ -0,0 +1,148 @@
+#!/usr/bin/python3
+
+import math
+
+
+class SpatialGrid(object):
+    """
+    uniform grid of square cells over 2d space,
+    every cell holds the things, whose position is inside,
+    so neighbour and occupancy queries look only at a few cells
+    instead of all things
+    """
+
+    def __init__(self, cell_size=8, attribute="position"):
+        """
+        (int) cell_size - width and height of one cell
+        (str) attribute - name of Vec2d position attribute of things
+        """
+        self.cell_size = cell_size
+        self.attribute = attribute
+        # (cell x, cell y) -> set of things
+        self.cells = {}
+        # (int x, int y) -> number of things on this pixel
+        self.pixels = {}
+        # thing -> (cell, pixel) where thing is registered
+        self.where = {}
+        # bounding box of used cells, to stop nearest search
+        self.min_cell = None
+        self.max_cell = None
+
+    def __len__(self):
+        return len(self.where)
+
+    def _keys(self, thing):
+        """return cell and pixel of thing's position"""
+        position = getattr(thing, self.attribute)
+        return (
+            (int(math.floor(position.x / self.cell_size)), int(math.floor(position.y / self.cell_size))),
+            (int(position.x), int(position.y)))
+
+    def insert(self, thing):
+        """add thing at its current position"""
+        (cell, pixel) = self._keys(thing)
+        self.where[thing] = (cell, pixel)
+        self.cells.setdefault(cell, set()).add(thing)
+        self.pixels[pixel] = self.pixels.get(pixel, 0) + 1
+        if self.min_cell is None:
+            self.min_cell = cell
+            self.max_cell = cell
+        else:
+            self.min_cell = (min(self.min_cell[0], cell[0]), min(self.min_cell[1], cell[1]))
+            self.max_cell = (max(self.max_cell[0], cell[0]), max(self.max_cell[1], cell[1]))
+
+    def remove(self, thing):
+        """remove thing from grid"""
+        (cell, pixel) = self.where.pop(thing)
+        things = self.cells[cell]
+        things.discard(thing)
+        if not things:
+            del self.cells[cell]
+        self.pixels[pixel] -= 1
+        if self.pixels[pixel] == 0:
+            del self.pixels[pixel]
+
+    def update(self, thing):
+        """
+        call after position of thing has changed,
+        the grid is only touched if thing moved to another pixel
+        """
+        if self.where[thing] != self._keys(thing):
+            self.remove(thing)
+            self.insert(thing)
+
+    def is_occupied(self, position, exclude=None):
+        """
+        return True if some thing other than exclude
+        is on the pixel of position
+        """
+        pixel = (int(position.x), int(position.y))
+        count = self.pixels.get(pixel, 0)
+        if exclude is not None and exclude in self.where and self.where[exclude][1] == pixel:
+            count -= 1
+        return count > 0
+
+    def nearest(self, position, exclude=None, max_distance=None):
+        """
+        return thing nearest to position, other than exclude,
+        None if there is no other thing
+        cells are searched in rings around position, until no
+        unsearched cell can hold a nearer thing.
+        every empty ring is searched too, so the cost grows with
+        (distance / cell_size) ** 2, cheap for dense sets only.
+        max_distance limits the search to things in this distance,
+        for sparse sets
+        """
+        cell_x = int(math.floor(position.x / self.cell_size))
+        cell_y = int(math.floor(position.y / self.cell_size))
+        if self.min_cell is None:
+            return None
+        # rings needed to cover all used cells
+        max_ring = max(
+            abs(cell_x - self.min_cell[0]), abs(cell_x - self.max_cell[0]),
+            abs(cell_y - self.min_cell[1]), abs(cell_y - self.max_cell[1]))
+        nearest_thing = None
+        min_dist = None
+        if max_distance is not None:
+            max_ring = min(max_ring, int(math.ceil(max_distance / float(self.cell_size))))
+            # things farther away are ignored
+            min_dist = max_distance ** 2
+        for ring in range(max_ring + 1):
+            # every thing in this ring is at least (ring - 1) * cell_size away
+            if min_dist is not None and min_dist <= (max(ring - 1, 0) * self.cell_size) ** 2:
+                break
+            for cell in self._ring(cell_x, cell_y, ring):
+                for thing in self.cells.get(cell, ()):
+                    if thing is exclude:
+                        continue
+                    other = getattr(thing, self.attribute)
+                    distance = (other.x - position.x) ** 2 + (other.y - position.y) ** 2
+                    if (min_dist is None) or (min_dist > distance):
+                        nearest_thing = thing
+                        min_dist = distance
+        return nearest_thing
+
+    def near(self, position, radius):
+        """return list of things in cells touching circle around position"""
+        low_x = int(math.floor((position.x - radius) / self.cell_size))
+        high_x = int(math.floor((position.x + radius) / self.cell_size))
+        low_y = int(math.floor((position.y - radius) / self.cell_size))
+        high_y = int(math.floor((position.y + radius) / self.cell_size))
+        things = []
+        for cell_x in range(low_x, high_x + 1):
+            for cell_y in range(low_y, high_y + 1):
+                things.extend(self.cells.get((cell_x, cell_y), ()))
+        return things
+
+    @staticmethod
+    def _ring(cell_x, cell_y, ring):
+        """cells with chebyshev distance ring around cell_x, cell_y"""
+        if ring == 0:
+            yield (cell_x, cell_y)
+            return
+        for offset in range(-ring, ring + 1):
+            yield (cell_x + offset, cell_y - ring)
+            yield (cell_x + offset, cell_y + ring)
+        for offset in range(-ring + 1, ring):
+            yield (cell_x - ring, cell_y + offset)
+            yield (cell_x + ring, cell_y + offset)
@@ -2,52 +2,97 @@
 
 import sys
 import pygame
-import random
-# own modules
-from Vec2d import Vec2d
-from Vec3d import Vec3d
+import numpy as np
+import RandomStream
 
 
 class Starfield(object):
-    """Starfield with 3D Points"""
+    """Starfield with 3D Points, stored as arrays of x, y and z"""
 
-    def __init__(self, surface, stars, depth, speed=0.01):
+    def __init__(self, surface, stars, depth, speed=0.01, decay=None, rng=None):
         """
         surface = pygame.Surface
-        stars - amount of strar to create
-        depth - z axis depth from 0 to 0+depth
+        stars - amount of stars to create
+        depth - ignored, kept for old callers, which got
+            (stars / depth) ** 3 stars
         speed - how fast should stars travel
+        decay - if given, stars are shaded by depth and accumulated
+            in a brightness buffer, which is multiplied by decay
+            every frame to leave trails, 0 < decay < 1
+        rng - RandomStream for star positions, stream Starfield if not given
         """
         self.surface = surface
+        if rng is None:
+            rng = RandomStream.get_stream("Starfield")
+        self.rng = rng
         self.stars = stars
         self.depth = depth
         self.speed = speed
+        self.decay = decay
         # set initial variables
         self.color = pygame.Color(255, 255, 255, 255)
+        self.x = None
+        self.y = None
+        self.z = None
+        self.brightness = None
+        if decay is not None:
+            self.brightness = np.zeros(surface.get_size(), dtype=np.float32)
         # initialize array
         self.generate()
 
     def generate(self):
-        """ generates 3d starfield, z=0 to z=depth """
-        depth_count = self.stars / self.depth
-        self.stars = []
-        for index in range(depth_count ** 3):
-            star_x = random.random() * 4 - 2
-            star_y = random.random() * 4 - 2
-            star_z = random.random() * 4 - 2
-            self.stars.append(Vec3d(star_x, star_y, star_z))
+        """ generates 3d starfield, every axis from -2 to 2 """
+        self.x = self.rng.random(self.stars) * 4 - 2
+        self.y = self.rng.random(self.stars) * 4 - 2
+        self.z = self.rng.random(self.stars) * 4 - 2
 
     def update(self, fov=2, viewer_distance=256):
         """update every frame"""
-        #parray = pygame.surfarray.pixels2d(surface)
-        for star in self.stars:
-            tstar = star.project(self.surface.get_width(), self.surface.get_height(), \
-                viewer_distance, fov)
-            tstar2d = Vec2d(tstar.x, tstar.y)
-            pygame.draw.line(self.surface, self.color, tstar2d, tstar2d, 1)
-            star.x -= self.speed
-            if star.x < -2:
-                star.x = 2
+        width = self.surface.get_width()
+        height = self.surface.get_height()
+        # perspective projection of all stars at once, like Vec3d.project
+        # was called before, with fov and viewer_distance swapped
+        factor = viewer_distance / (fov + self.z)
+        xs = self.x * factor + width / 2
+        ys = -self.y * factor + height / 2
+        visible = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+        xs = xs[visible].astype(np.intp)
+        ys = ys[visible].astype(np.intp)
+        pixel2d = pygame.surfarray.pixels2d(self.surface)
+        if self.decay is None:
+            # plot all visible stars with one scatter
+            pixel2d[xs, ys] = self.surface.map_rgb(self.color)
+        else:
+            self.accumulate(pixel2d, xs, ys, self.z[visible])
+        del pixel2d
+        # move stars and wrap around
+        self.x -= self.speed
+        self.x[self.x < -2] = 2
+
+    def accumulate(self, pixel2d, xs, ys, zs):
+        """
+        fade brightness buffer, add stars shaded by depth, nearer
+        stars are brighter, and blend buffer tinted with color into
+        pixel2d, every channel keeps the brighter of star and what
+        was drawn before, pixels without star light stay untouched
+        the cost depends on surface size, not on length of trails
+        """
+        self.brightness *= self.decay
+        # z from 2 (far) to -2 (near) gives brightness 0.1 to 1.0
+        shade = 0.1 + 0.9 * np.clip((2 - zs) / 4, 0, 1)
+        # sum stars on the same pixel, (x, y) as index into flat buffer
+        self.brightness += np.bincount(xs * self.brightness.shape[1] + ys, weights=shade, minlength=self.brightness.size).reshape(self.brightness.shape)
+        # below one step of 255 nothing would change
+        lit = self.brightness >= 1.0 / 255
+        level = np.minimum(self.brightness[lit], 1.0)
+        pixels = pixel2d[lit]
+        shifts = self.surface.get_shifts()[:3]
+        masks = self.surface.get_masks()[:3]
+        for (shift, mask, value) in zip(shifts, masks, tuple(self.color)[:3]):
+            mask = np.uint32(mask)
+            channel = np.maximum((pixels & mask) >> np.uint32(shift), (level * value).astype(np.uint32))
+            pixels = (pixels & ~mask) | (channel << np.uint32(shift))
+        pixel2d[lit] = pixels
 
 def test():
     """test"""
@@ -56,7 +101,7 @@ def test():
         surface = pygame.display.set_mode((600, 600))
         pygame.init()
         spheres = (
-            Starfield(surface, stars=100, depth=10, speed=0.01),
+            Starfield(surface, stars=20000, depth=10, speed=0.01, decay=0.9),
             )
         clock = pygame.time.Clock()       
         # for 3d projection
@@ -0,0 +1,56 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import unittest
+import numpy as np
+# own modules
+from BarnesHut import BarnesHut as BarnesHut
+from RandomStream import RandomStream as RandomStream
+
+
+class TestBarnesHut(unittest.TestCase):
+
+    def setUp(self):
+        """seeded cloud of particles of three kinds"""
+        rng = RandomStream(42)
+        self.positions = rng.random((2000, 2)) * 600
+        self.kinds = rng.randint(0, 3, 2000)
+
+    def get_error(self, theta):
+        """relative error of approximated to exact forces"""
+        solver = BarnesHut(theta=theta)
+        forces = solver.get_forces(self.positions, self.kinds)
+        exact = solver.get_forces_exact(self.positions, self.kinds)
+        return(np.linalg.norm(forces - exact) / np.linalg.norm(exact))
+
+    def test_exact(self):
+        """theta 0 opens every node, so it is the exact sum"""
+        self.assertTrue(self.get_error(0.0) < 1e-12)
+
+    def test_approximation(self):
+        """theta 0.5 and default theta stay near the exact sum"""
+        self.assertTrue(self.get_error(0.5) < 0.005)
+        self.assertTrue(self.get_error(1.0) < 0.02)
+
+    def test_leaf_size(self):
+        """nodes are split down to leaf_size particles, result does not depend on it"""
+        solver = BarnesHut(theta=0.0, leaf_size=3)
+        tree = solver.build(self.positions, self.kinds)
+        self.assertTrue((tree["stop"] - tree["start"])[tree["leaf"]].max() <= 3)
+        self.assertTrue((tree["stop"] - tree["start"])[~tree["leaf"]].min() > 3)
+        exact = solver.get_forces_exact(self.positions, self.kinds)
+        self.assertTrue(np.allclose(solver.get_forces(self.positions, self.kinds), exact, rtol=1e-9, atol=1e-12))
+
+    def test_few_particles(self):
+        """no forces without other particles"""
+        solver = BarnesHut()
+        self.assertEqual(solver.get_forces(np.zeros((1, 2)), np.zeros(1)).tolist(), [[0.0, 0.0]])
+        forces = solver.get_forces(((0.0, 0.0), (10.0, 0.0)), (0, 0))
+        exact = solver.get_forces_exact(((0.0, 0.0), (10.0, 0.0)), (0, 0))
+        self.assertTrue(np.allclose(forces, exact))
+        # protons attract each other
+        self.assertTrue(forces[0, 0] > 0 and forces[1, 0] < 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import unittest
+# own modules
+import RandomStream
+import headless
+
+
+class TestRandomStream(unittest.TestCase):
+
+    def tearDown(self):
+        """other tests get not reproducible streams again"""
+        RandomStream.set_seed(None)
+        RandomStream.streams.clear()
+
+    def draw(self, stream):
+        """single values and arrays, in mixed order"""
+        return([
+            stream.random(),
+            stream.uniform(-1, 1),
+            stream.randint(0, 256),
+            stream.random(4).tolist(),
+            stream.randint(0, 256, 4).tolist(),
+            stream.random(),
+        ])
+
+    def test_replay(self):
+        """set_seed starts all streams again"""
+        RandomStream.set_seed(42)
+        first = self.draw(RandomStream.get_stream("Fire"))
+        RandomStream.set_seed(42)
+        self.assertEqual(self.draw(RandomStream.get_stream("Fire")), first)
+        RandomStream.set_seed(43)
+        self.assertNotEqual(self.draw(RandomStream.get_stream("Fire")), first)
+
+    def test_independent(self):
+        """drawing from one stream does not change another"""
+        RandomStream.set_seed(42)
+        first = self.draw(RandomStream.get_stream("Starfield"))
+        RandomStream.set_seed(42)
+        for _ in range(10):
+            self.draw(RandomStream.get_stream("Fire"))
+        self.assertEqual(self.draw(RandomStream.get_stream("Starfield")), first)
+        # same master seed, different names, different numbers
+        self.assertNotEqual(RandomStream.get_seed("Fire"), RandomStream.get_seed("Starfield"))
+
+    def test_headless_checksum(self):
+        """same seed gives bit for bit the same frame"""
+        results = [headless.run(headless.starfield, 320, 200, frames=5, warmup=0, seed=seed) for seed in (42, 42, 43)]
+        self.assertEqual(results[0]["checksum"], results[1]["checksum"])
+        self.assertNotEqual(results[0]["checksum"], results[2]["checksum"])
+
+
+if __name__ == "__main__":
+    unittest.main()
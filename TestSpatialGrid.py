@@ -0,0 +1,72 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import unittest
+# own modules
+from Vec2d import Vec2d as Vec2d
+from SpatialGrid import SpatialGrid as SpatialGrid
+from RandomStream import RandomStream as RandomStream
+
+
+class Thing(object):
+    """thing with position, like the particles"""
+
+    def __init__(self, x, y):
+        self.position = Vec2d(x, y)
+
+
+class TestSpatialGrid(unittest.TestCase):
+
+    def setUp(self):
+        """sparse seeded set of things"""
+        self.rng = RandomStream(42)
+        self.grid = SpatialGrid(cell_size=8)
+        self.things = [Thing(self.rng.uniform(0, 350), self.rng.uniform(0, 350)) for _ in range(30)]
+        for thing in self.things:
+            self.grid.insert(thing)
+
+    def get_nearest(self, position, max_distance=None):
+        """nearest thing by brute force"""
+        nearest = None
+        min_dist = None
+        for thing in self.things:
+            distance = (thing.position.x - position.x) ** 2 + (thing.position.y - position.y) ** 2
+            if max_distance is not None and distance >= max_distance ** 2:
+                continue
+            if (min_dist is None) or (min_dist > distance):
+                nearest = thing
+                min_dist = distance
+        return(nearest)
+
+    def test_nearest(self):
+        """same result as brute force, also with short max_distance"""
+        for _ in range(500):
+            position = Vec2d(self.rng.uniform(0, 350), self.rng.uniform(0, 350))
+            for max_distance in (None, 4, 8, 20, 60):
+                self.assertTrue(self.grid.nearest(position, max_distance=max_distance) is self.get_nearest(position, max_distance))
+
+    def test_neighbour(self):
+        """neighbour in the same cell, max_distance below cell_size"""
+        first = Thing(100.5, 100.5)
+        second = Thing(101.5, 100.5)
+        grid = SpatialGrid(cell_size=8)
+        grid.insert(first)
+        grid.insert(second)
+        for max_distance in (2, 5, 8, 20, None):
+            self.assertTrue(grid.nearest(first.position, exclude=first, max_distance=max_distance) is second)
+        self.assertTrue(grid.nearest(first.position, exclude=first, max_distance=0.5) is None)
+
+    def test_occupied(self):
+        """pixels are counted, moving updates them"""
+        thing = self.things[0]
+        pixel = Vec2d(int(thing.position.x), int(thing.position.y))
+        self.assertTrue(self.grid.is_occupied(pixel))
+        self.assertFalse(self.grid.is_occupied(pixel, exclude=thing))
+        thing.position = Vec2d(400.5, 400.5)
+        self.grid.update(thing)
+        self.assertFalse(self.grid.is_occupied(pixel))
+        self.assertTrue(self.grid.is_occupied(Vec2d(400, 400)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import unittest
+import math
+# own modules
+import Utils3d
+
+
+class TestUtils3d(unittest.TestCase):
+
+    def test_rot_matrices(self):
+        """element wise rotation matrices equal the product of single rotations"""
+        static_transformation = Utils3d.get_scale_rot_matrix(
+            scale_tuple=(600, 600, 1),
+            aspect_tuple=(16, 9),
+            shift_tuple=(0, 0, -10))
+        degrees = (1, 2, 3)
+        matrices = Utils3d.get_rot_matrix(static_transformation, degrees, 360)
+        self.assertEqual(matrices.shape, (360, 4, 4))
+        for step in range(360):
+            (theta_x, theta_y, theta_z) = [math.radians(step * degree) for degree in degrees]
+            expected = static_transformation.dot(
+                Utils3d.get_rot_z_matrix(theta_z).dot(
+                    Utils3d.get_rot_x_matrix(theta_x).dot(
+                        Utils3d.get_rot_y_matrix(theta_y))))
+            self.assertTrue(abs(matrices[step] - expected).max() < 1e-9)
+
+    def test_transformation_table(self):
+        """lazy table gives the same matrices as get_rot_matrix"""
+        static_transformation = Utils3d.get_scale_rot_matrix(
+            scale_tuple=(200, 200, 1),
+            aspect_tuple=(4, 3),
+            shift_tuple=(0, 0, -5))
+        matrices = Utils3d.get_rot_matrix(static_transformation, (2, 3, 1), 90)
+        table = Utils3d.TransformationTable(static_transformation, (2, 3, 1), 90)
+        self.assertEqual(len(table), 90)
+        # single steps on first access, then the rest at once
+        for step in (0, 45, 89, 45):
+            self.assertTrue(abs(table[step] - matrices[step]).max() < 1e-12)
+        self.assertTrue(abs(table.fill() - matrices).max() < 1e-12)
+        # shared table from cache
+        cached = Utils3d.get_rot_matrix_table(static_transformation, (2, 3, 1), 90, lazy=False)
+        self.assertTrue(cached is Utils3d.get_rot_matrix_table(static_transformation, (2, 3, 1), 90))
+        self.assertTrue(abs(cached.matrices - matrices).max() < 1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
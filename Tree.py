@@ -3,23 +3,28 @@
 import pygame
 import sys
 import math
-import random
 # own modules
 from Vec2d import Vec2d
+import RandomStream
 
 
 class Tree(object):
     """Tree in 2D"""
 
-    def __init__(self, surface, color, root, depth, length):
+    def __init__(self, surface, color, root, depth, length, rng=None):
         """
         (pygame.Surface) surface - to draw on
         (pygame.Color) color - to draw branches
         (Vec2d) root of tree root
         (int) depth - how many branches
         (int) length - length of initial branch
+        (RandomStream) rng - source of random numbers,
+            stream Tree if not given
         """ 
         self.surface = surface
+        if rng is None:
+            rng = RandomStream.get_stream("Tree")
+        self.rng = rng
         self.color = color
         self.root = root
         self.depth = depth
@@ -55,7 +60,7 @@ class Tree(object):
         """this method is recurdively called"""
         if depth == 0:
             if self.leafs is True:
-                leaf_color = (random.randint(16, 65), int(length * 2 + 40), 0)
+                leaf_color = (self.rng.randint(16, 66), int(length * 2 + 40), 0)
                 self.storyboard.append((pygame.draw.ellipse, (self.surface, leaf_color, (int(root.x), int(root.y), 10, 10), 0)))
             return
         # forward
@@ -64,7 +69,7 @@ class Tree(object):
         angle -= self.total_angle / 2.0
         for i in range(self.branching_factor):
             # next recursion, smaller
-            self.tree(depth - 1, length * self.scale_factor * (0.5 + random.random() * 0.5), root, angle)
+            self.tree(depth - 1, length * self.scale_factor * (0.5 + self.rng.random() * 0.5), root, angle)
             # turn left, one step
             angle += self.angle_between_branches
             # next branch
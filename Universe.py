@@ -2,10 +2,10 @@
 
 import sys
 import pygame
-import random
 # own modules
 from Vec2d import Vec2d
 from Vec3d import Vec3d
+import RandomStream
 
 
 class Thing(object):
@@ -17,10 +17,11 @@ class Thing(object):
         self.surface = surface
         self.universe = universe
         self.pos2d = pos2d
-        self.mass = random.random()
+        rng = universe.rng
+        self.mass = rng.random()
         print self.mass
-        self.acceleration = random.random()
-        self.direction = Vec2d(random.random(), random.random()) * self.mass
+        self.acceleration = rng.random()
+        self.direction = Vec2d(rng.random(), rng.random()) * self.mass
         self.color = pygame.Color(int(128 + 127 * self.mass), 0, 0, 255)
 
     def draw(self, viewer_distance, fov):
@@ -143,14 +144,18 @@ class Universe(object):
 
     kinds = (Proton, Electron, Neutron)
 
-    def __init__(self, surface, stars, speed=0.01):
+    def __init__(self, surface, stars, speed=0.01, rng=None):
         """
         surface = pygame.Surface
         stars - amount of strar to create
         depth - z axis depth from 0 to 0+depth
         speed - how fast should stars travel
+        rng - RandomStream for all things, stream Universe if not given
         """
         self.surface = surface
+        if rng is None:
+            rng = RandomStream.get_stream("Universe")
+        self.rng = rng
         self.stars = stars
         self.speed = speed
         # set initial variables
@@ -162,9 +167,10 @@ class Universe(object):
     def generate(self):
         """ generates 3d starfield, z=0 to z=depth """
         for index in range(self.stars):
-            index = int(random.random() * len(self.kinds))
-            pos2d = Vec2d(random.random() * self.surface.get_width(), random.random() * self.surface.get_height())
-            self.things.append(self.kinds[index](self.surface, self, pos2d, self.color))
+            index = self.rng.randint(0, len(self.kinds))
+            pos2d = Vec2d(self.rng.random() * self.surface.get_width(), self.rng.random() * self.surface.get_height())
+            thing = self.kinds[index](self.surface, self, pos2d, self.color)
+            self.things.append(thing)
 
     def update(self, fov=2, viewer_distance=256):
         """update every frame"""
@@ -20,7 +20,7 @@ def test():
         #fps = 150
         surface = pygame.display.set_mode((600, 600))
         pygame.init()
-        cube = Utils3d.get_cube_polygons()
+        cube = Utils3d.get_cube_mesh()
         objects = []
         for y in range(100, 500, 50):
             for x in range(100, 500, 50):
@@ -36,7 +36,7 @@ def test():
                                     shift_tuple=(0, 0, -10)),
                                 degrees=((x-y+20)/50, (y-x+40)/50, 3),
                                 steps=360),
-                        polygons = cube)
+                        mesh = cube)
                 )
         clock = pygame.time.Clock()       
         pause = False
@@ -2,9 +2,9 @@
 
 import pygame
 import sys
-import random
 import numpy
 from Fire import Fire as Fire
+import RandomStream
 
 
 class FirePy(object):
@@ -14,28 +14,44 @@ class FirePy(object):
     http://lodev.org/cgtutor/fire.html
     """
 
-    def __init__(self, surface, rect, scale=4):
+    def __init__(self, surface, rect, scale=4, rng=None):
         """
         (pygame.surface) surface - to draw on
         (pygame.Rect) dest - rect to blit fire on
         (int) width - width of fire
         (int) height - height of fire
         (int) scale - scale fire
+        (RandomStream) rng - source of random numbers,
+            stream FirePy if not given
         """ 
         self.surface = surface
+        if rng is None:
+            rng = RandomStream.get_stream("FirePy")
+        self.rng = rng
         self.rect = rect
-        self.width = rect.width / scale
-        self.height = rect.height / scale
+        self.array2d = None
+        self.fire = None
+        self.palette = None
+        self.set_scale(scale)
+
+    def set_scale(self, scale):
+        """
+        change internal resolution to size of rect / scale,
+        fire starts again in new size
+        """
+        self.width = self.rect.width / scale
+        self.height = self.rect.height / scale
         self.scale = scale
         # initialize values
         # scaled down surface
         self.drawsurface = pygame.Surface((self.width, self.height))
         self.drawsurface.fill((0, 0, 0))
-        self.array2d = None
-        self.fire = None
-        self.palette = None
         self.initialize()
 
+    def get_scale(self):
+        """return current scaling factor"""
+        return self.scale
+
     def initialize(self):
         """generate palette and surface to draw intermdiate fire, also array"""
         # self.drawsurface.fill((0, 0, 0))
@@ -59,9 +75,8 @@ class FirePy(object):
         """update every frame"""
         w = self.width
         h = self.height
-        # random baseline
-        for x in range(w):
-            self.fire[x][h - 1] = abs(32768 + random.randint(0, 32768)) % 256
+        # random baseline, whole row at once
+        self.fire[:, h - 1] = self.rng.randint(0, 256, w)
         # calculate each pixel according to neighbours
         for y in range(h - 1):
             for x in range(w):
@@ -91,7 +106,7 @@ def test():
         surface = pygame.display.set_mode((320, 200))
         pygame.init()
         spheres = (
-            Fire(surface, 2), 
+            Fire(surface, surface.get_rect(), 2),
             )
         clock = pygame.time.Clock()       
         pause = False
@@ -17,16 +17,16 @@ def test():
         #fps = 150
         surface = pygame.display.set_mode((600, 600))
         pygame.init()
-        cube = Utils3d.get_cube_polygons()
+        cube = Utils3d.get_cube_mesh()
         objects = []
         for y in range(100, 500, 50):
             for x in range(100, 500, 50):
                 objects.append(
                     Mesh(
                         surface,
-                        origin=(300, 300), 
+                        origin=(x, y),
                         transformations = Transformer.flying_cubes_t(x, y),
-                        polygons = cube)
+                        mesh = cube)
                 )
         clock = pygame.time.Clock()       
         pause = False
@@ -0,0 +1,257 @@
+#!/usr/bin/python
+"""
+headless benchmark runner
+
+drives the update() method of one effect on an offscreen pygame.Surface
+for a fixed number of frames, no window and no frame limiter needed.
+the SDL dummy video driver is used, so this runs also on machines
+without display.
+
+the result is printed as JSON, per frame latencies in milliseconds.
+stdout holds only the JSON, anything the effects print goes to stderr
+
+usage:
+    headless.py plasma --width 800 --height 600 --frames 200
+    headless.py --list
+"""
+
+import os
+# has to be set before pygame initializes its video subsystem
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+# no pygame banner on stdout
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import sys
+import json
+import zlib
+import timeit
+import argparse
+import pygame
+import numpy as np
+import RandomStream
+
+
+def plasma(surface):
+    from Plasma import Plasma as Plasma
+    return(Plasma(surface, scale=1))
+
+def plasma_cycle(surface):
+    from Plasma import Plasma as Plasma
+    return(Plasma(surface, scale=1, cycle=True))
+
+def plasma_fixed(surface):
+    from PlasmaFixed import PlasmaFixed as PlasmaFixed
+    return(PlasmaFixed(surface, scale=1))
+
+def plasma_fractal(surface):
+    from PlasmaFractal import PlasmaFractal as PlasmaFractal
+    return(PlasmaFractal(surface))
+
+def plasma_fractal_cycle(surface):
+    from PlasmaFractal import PlasmaFractal as PlasmaFractal
+    return(PlasmaFractal(surface, animation="cycle"))
+
+def plasma_fractal_blend(surface):
+    from PlasmaFractal import PlasmaFractal as PlasmaFractal
+    return(PlasmaFractal(surface, animation="blend"))
+
+def plasma_fractal2(surface):
+    from PlasmaFractal2 import PlasmaFractal2 as PlasmaFractal2
+    return(PlasmaFractal2(surface))
+
+def fire(surface):
+    from Fire import Fire as Fire
+    return(Fire(surface, surface.get_rect(), scale=4))
+
+def mandelbrot(surface):
+    from Mandelbrot import Mandelbrot as Mandelbrot
+    return(Mandelbrot(surface))
+
+def coffee(surface):
+    from CoffeeBean import CoffeeDraw as CoffeeDraw
+    return(CoffeeDraw(surface))
+
+def hilbert(surface):
+    from HilbertCurve import HilbertCurve as HilbertCurve
+    return(HilbertCurve(surface))
+
+def sinus_text(surface):
+    from SinusText import SinusText as SinusText
+    return(SinusText(surface, "SimpleDemo by GunnerySergeant", surface.get_height() // 3, 30, 2, pygame.Color(0, 255, 255)))
+
+def cube(surface):
+    import Utils3d
+    from Mesh import Mesh as Mesh
+    return(Mesh(
+        surface,
+        origin=(surface.get_width() // 2, surface.get_height() // 2),
+        transformations=
+            Utils3d.get_rot_matrix(
+                Utils3d.get_scale_rot_matrix(
+                    scale_tuple=(600, 600, 1),
+                    aspect_tuple=(16, 9),
+                    shift_tuple=(0, 0, -10)),
+                degrees=(1, 2, 3),
+                steps=360),
+        mesh=Utils3d.get_cube_mesh()))
+
+def starfield(surface):
+    from Starfield import Starfield as Starfield
+    return(Starfield(surface, stars=1000, depth=10, speed=0.01))
+
+def particles(surface):
+    from ExplodingParticles import Universe as Universe
+    return(Universe(surface, number=50, speed=0.01))
+
+def get_particle_cloud(surface, number=20000):
+    """random positions and kinds of particles all over surface"""
+    rng = RandomStream.get_stream("ParticleSystem")
+    positions = rng.random((number, 2)) * surface.get_size()
+    kinds = rng.randint(0, 3, number)
+    return(positions, kinds)
+
+def particle_system(surface):
+    from ParticleSystem import ParticleSystem as ParticleSystem
+    (positions, kinds) = get_particle_cloud(surface)
+    return(ParticleSystem(surface, positions, kinds, strength=0.1))
+
+def particle_system_barnes_hut(surface):
+    from ParticleSystem import ParticleSystem as ParticleSystem
+    from BarnesHut import BarnesHut as BarnesHut
+    (positions, kinds) = get_particle_cloud(surface)
+    return(ParticleSystem(surface, positions, kinds, strength=0.1, solver=BarnesHut()))
+
+# name of effect -> function returning effect object, called with
+# the offscreen surface, modules are imported only if needed
+EFFECTS = {
+    "plasma" : plasma,
+    "plasma_cycle" : plasma_cycle,
+    "plasma_fixed" : plasma_fixed,
+    "plasma_fractal" : plasma_fractal,
+    "plasma_fractal_cycle" : plasma_fractal_cycle,
+    "plasma_fractal_blend" : plasma_fractal_blend,
+    "plasma_fractal2" : plasma_fractal2,
+    "fire" : fire,
+    "mandelbrot" : mandelbrot,
+    "coffee" : coffee,
+    "hilbert" : hilbert,
+    "sinus_text" : sinus_text,
+    "cube" : cube,
+    "starfield" : starfield,
+    "particles" : particles,
+    "particle_system" : particle_system,
+    "particle_system_barnes_hut" : particle_system_barnes_hut,
+}
+
+
+def run(factory, width=800, height=600, frames=100, warmup=5, clear=True, seed=None):
+    """
+    create effect with factory on offscreen surface and call update()
+    warmup + frames times, only the last frames calls are measured
+
+    (function) factory - called with surface, returns effect
+    (int) width - width of offscreen surface
+    (int) height - height of offscreen surface
+    (int) frames - number of measured frames
+    (int) warmup - number of frames run before measuring
+    (bool) clear - fill surface black before every frame, like the drivers do
+    (int) seed - master seed of RandomStream, frames of effects
+        using their random streams can be compared by checksum
+
+    returns dict with frame rate, latency percentiles in milliseconds
+    and crc32 checksum of the last frame
+    """
+    if seed is not None:
+        RandomStream.set_seed(seed)
+    pygame.init()
+    surface = pygame.Surface((width, height))
+    surface.fill((0, 0, 0, 255))
+    starttime = timeit.default_timer()
+    effect = factory(surface)
+    setup_duration = timeit.default_timer() - starttime
+    for _ in range(warmup):
+        if clear is True:
+            surface.fill((0, 0, 0, 255))
+        effect.update()
+    latencies = np.zeros(frames, dtype=np.float64)
+    for frame in range(frames):
+        if clear is True:
+            surface.fill((0, 0, 0, 255))
+        starttime = timeit.default_timer()
+        effect.update()
+        latencies[frame] = timeit.default_timer() - starttime
+    duration = latencies.sum()
+    latencies *= 1000.0
+    return({
+        "width" : width,
+        "height" : height,
+        "frames" : frames,
+        "warmup" : warmup,
+        "seed" : seed,
+        "checksum" : zlib.crc32(pygame.image.tostring(surface, "RGB")) & 0xffffffff,
+        "setup_s" : setup_duration,
+        "duration_s" : duration,
+        "fps" : frames / duration if duration > 0 else None,
+        "latency_ms" : {
+            "min" : latencies.min(),
+            "mean" : latencies.mean(),
+            "p50" : np.percentile(latencies, 50),
+            "p90" : np.percentile(latencies, 90),
+            "p95" : np.percentile(latencies, 95),
+            "p99" : np.percentile(latencies, 99),
+            "max" : latencies.max(),
+        },
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="run effect offscreen and report frame timings as JSON")
+    parser.add_argument("effect", nargs="?", help="name of effect, see --list")
+    parser.add_argument("--list", action="store_true", help="list available effects")
+    parser.add_argument("--width", type=int, default=800)
+    parser.add_argument("--height", type=int, default=600)
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--no-clear", dest="clear", action="store_false", help="do not fill surface before every frame")
+    parser.add_argument("--output", help="write JSON to this file instead of stdout")
+    parser.add_argument("--seed", type=int, help="seed random streams of effects, for reproducible frames")
+    parser.add_argument("--target-fps", type=int, help="adjust scale of effect at runtime to hold this frame rate")
+    args = parser.parse_args()
+    if args.list is True:
+        sys.stdout.write("\n".join(sorted(EFFECTS)) + "\n")
+        return(0)
+    if args.effect not in EFFECTS:
+        parser.error("unknown effect %r, choose one of %s" % (args.effect, ", ".join(sorted(EFFECTS))))
+    if args.frames < 1:
+        parser.error("--frames has to be at least 1")
+    if args.warmup < 0:
+        parser.error("--warmup can not be negative")
+    factory = EFFECTS[args.effect]
+    if args.target_fps is not None:
+        from ResolutionController import ResolutionController as ResolutionController
+        effect_factory = factory
+        def factory(surface):
+            effect = effect_factory(surface)
+            if not (hasattr(effect, "set_scale") and hasattr(effect, "get_scale")):
+                parser.error("effect %r has no set_scale and get_scale, --target-fps is not possible" % args.effect)
+            return(ResolutionController(effect, fps=args.target_fps))
+    # effects print messages while they are created and updated,
+    # keep them out of the JSON on stdout
+    stdout = sys.stdout
+    sys.stdout = sys.stderr
+    try:
+        result = run(factory, args.width, args.height, args.frames, args.warmup, args.clear, args.seed)
+    finally:
+        sys.stdout = stdout
+    result["effect"] = args.effect
+    result["target_fps"] = args.target_fps
+    data = json.dumps(result, indent=4, sort_keys=True)
+    if args.output is not None:
+        with open(args.output, "w") as outfile:
+            outfile.write(data + "\n")
+    else:
+        sys.stdout.write(data + "\n")
+    return(0)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,7 +16,7 @@ def test():
         things = (
                 {   "start": 0,
                     "stop": 999,
-                    "class" : Plasma(surface, scale=2),
+                    "class" : Plasma(surface, scale=1),
                 },
             )
         clock = pygame.time.Clock()       
@@ -7,6 +7,7 @@ import pygame
 import random
 import string
 import os
+import FontCache
 # from pygame.locals import *
 
 CHARACTERS = list(string.letters)
@@ -19,10 +20,15 @@ FPS = 25
 BACKGROUND_MUSIC = "monkey_island_theme.mp3"
 # define some fonts
 pygame.font.init()
-TITLE_FONT = pygame.font.Font("atari full.ttf", 32) # title
-CHARACTER_FONT = pygame.font.Font(None, 48) # the falling characters
-SCORE_FONT = pygame.font.Font("atari full.ttf", 24) # score
-INFO_FONT = pygame.font.Font("atari full.ttf", 12) # other messages
+FONT_FACE = "atari full.ttf"
+TITLE_SIZE = 32
+SCORE_SIZE = 24
+INFO_SIZE = 12
+TITLE_FONT = FontCache.get_font(FONT_FACE, TITLE_SIZE) # title
+CHARACTER_FONT = FontCache.get_font(None, 48) # the falling characters
+SCORE_FONT = FontCache.get_font(FONT_FACE, SCORE_SIZE) # score
+INFO_FONT = FontCache.get_font(FONT_FACE, INFO_SIZE) # other messages
+WHITE = (255, 255, 255)
 
 
 class GameStat:
@@ -152,11 +158,11 @@ class CharEngine:
         # top surface
         # blit score in left upper corner
         scorestring = "Score : %s" % self.gamestat.score
-        scorefont = SCORE_FONT.render(scorestring, 1, (255, 255, 255))
+        scorefont = FontCache.render(FONT_FACE, SCORE_SIZE, False, scorestring, WHITE)
         self.head_surface.blit(scorefont, (0, 0))
         # blit lifes right
         lifestring = "Lifes: %s" % self.gamestat.lifes
-        lifefont = SCORE_FONT.render(lifestring, 1, (255, 255, 255))
+        lifefont = FontCache.render(FONT_FACE, SCORE_SIZE, False, lifestring, WHITE)
         self.head_surface.blit(lifefont, (self.surface.get_width() - lifefont.get_width(), 0))
 
     def update_footer(self):
@@ -165,15 +171,15 @@ class CharEngine:
         # blit info txt in footer
         # Level
         levelstring = "Level: %s" % self.gamestat.level
-        levelfont = INFO_FONT.render(levelstring, 1, (255, 255, 255))
+        levelfont = FontCache.render(FONT_FACE, INFO_SIZE, False, levelstring, WHITE)
         self.foot_surface.blit(levelfont, (0, 0))
         # Remaining Time
         timestring = "Time remaining: %s" % self.remaining_time
-        timefont = INFO_FONT.render(timestring, 1, (255, 255, 255))
+        timefont = FontCache.render(FONT_FACE, INFO_SIZE, False, timestring, WHITE)
         self.foot_surface.blit(timefont, (self.surface.get_width() - timefont.get_width(), 0))
         # Info Text - center - second line
         infostring = "Press ESC to quit, click all Characters to win"
-        infofont = INFO_FONT.render(infostring, 1, (255, 255, 255))
+        infofont = FontCache.render(FONT_FACE, INFO_SIZE, False, infostring, WHITE)
         self.foot_surface.blit(infofont, (self.foot_surface.get_width() / 2 - infofont.get_width() / 2, 25))
        
     def generate(self):
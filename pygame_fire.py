@@ -39,7 +39,7 @@ def main():
             Circle(surface, (100, 0, 0), Vec3d(1.5, -1.5, -1.5), Vec3d(1, 1, 1)),
             Tree(surface, pygame.Color(0, 100, 100), Vec2d(300, 500), 5, 50),
             Tree(surface, pygame.Color(0, 100, 100), Vec2d(330, 500), 5, 100),
-            Starfield(surface, stars=100, depth=10),
+            Starfield(surface, stars=1000, depth=10),
             InfoRenderer(surface, pygame.Color(0, 255, 0), pos=Vec2d(100,100), size=10),
             ScrollText(surface, "Dolor Ipsum Dolor uswef", 400, pygame.Color(255,255,0)),
             SinusText(surface, "Dolor Ipsum Dolor uswef", 200, 30, 2, pygame.Color(0,255,255)),
@@ -21,7 +21,7 @@ def test():
         fps = 15
         surface = pygame.display.set_mode((600, 600))
         pygame.init()
-        cube = Utils3d.get_cube_polygons()
+        cube = Utils3d.get_cube_mesh()
         objects = []
         objects.append(
             Mesh(
@@ -35,7 +35,8 @@ def test():
                             shift_tuple=(0, 0, -10)),
                         degrees=(1, 2, 3),
                         steps=360),
-                polygons = cube)
+                mesh = cube,
+                fill = True)
         )
         clock = pygame.time.Clock()       
         pause = False
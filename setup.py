@@ -10,6 +10,9 @@ directive_defaults['profile'] = False
 # extra compile flags
 extra_compile_args = ["-O3"]
 #extra_compile_args = []
+# Mandelbrot renders row bands in parallel with prange
+openmp_compile_args = extra_compile_args + ["-fopenmp"]
+openmp_link_args = ["-fopenmp"]
 
 #sys.argv.append("build_ext")
 #sys.argv.append("--inplace")
@@ -17,12 +20,14 @@ extra_compile_args = ["-O3"]
 extensions = [
     Extension("Polygon", ["src/Polygon.pyx"], extra_compile_args=extra_compile_args),
     Extension("Utils3d", ["src/Utils3d.pyx"], extra_compile_args=extra_compile_args),
+    Extension("Transformer", ["src/Transformer.pyx"], extra_compile_args=extra_compile_args),
     Extension("Mesh", ["src/Mesh.pyx"], extra_compile_args=extra_compile_args),
     Extension("Plasma", ["src/Plasma.pyx"], extra_compile_args=extra_compile_args),
+    Extension("PlasmaFixed", ["src/PlasmaFixed.pyx"], extra_compile_args=extra_compile_args),
     Extension("PlasmaPy", ["src/PlasmaPy.py"], extra_compile_args=extra_compile_args),
     Extension("PlasmaFractal", ["src/PlasmaFractal.pyx"], extra_compile_args=extra_compile_args),
     Extension("PlasmaFractal2", ["src/PlasmaFractal2.py"], extra_compile_args=extra_compile_args),
-    Extension("Mandelbrot", ["src/Mandelbrot.pyx"], extra_compile_args=extra_compile_args),
+    Extension("Mandelbrot", ["src/Mandelbrot.pyx"], extra_compile_args=openmp_compile_args, extra_link_args=openmp_link_args),
     Extension("CoffeeBean", ["src/CoffeeBean.pyx"], extra_compile_args=extra_compile_args),
     Extension("SinusText", ["src/SinusText.pyx"], extra_compile_args=extra_compile_args),
     Extension("HilbertCurve", ["src/HilbertCurve.pyx"], extra_compile_args=extra_compile_args),
@@ -8,9 +8,13 @@ import time
 from SinusText import SinusText as SinusText
 from Plasma import Plasma as Plasma
 from PlasmaFractal import PlasmaFractal as PlasmaFractal
+from PlasmaFractal import get_heightmap as get_heightmap
+from PlasmaFractal import get_exponent as get_exponent
 from CoffeeBean import CoffeeDraw as CoffeeDraw
 import Utils3d
 from Mesh import Mesh as Mesh
+from Sequencer import Sequencer as Sequencer
+from ResolutionController import ResolutionController as ResolutionController
 
 def test():
     try:
@@ -18,31 +22,32 @@ def test():
         surface = pygame.display.set_mode((800, 600))
         print pygame.display.Info()
         pygame.init()
-        things = (
+        # effects are built by the sequencer shortly before
+        # their scene starts and dropped after it stops,
+        # prepare runs in background and must not call pygame
+        scenes = (
                 {"start" : 0, "stop" : 10,
-                    "class" : SinusText(surface, "SimpleDemo by GunnerySergeant", 200, 20, 1, pygame.Color(0,255,255))},
+                    "factory" : lambda surface: SinusText(surface, "SimpleDemo by GunnerySergeant", 200, 20, 1, pygame.Color(0,255,255))},
                 {"start" : 10, "stop" : 20,
-                    "class" : SinusText(surface, "Start with some Plasma Effect", 200, 30, 2, pygame.Color(0,255,255)),},
+                    "factory" : lambda surface: SinusText(surface, "Start with some Plasma Effect", 200, 30, 2, pygame.Color(0,255,255)),},
                 {"start" : 20, "stop": 30,
-                    "class" : Plasma(surface, scale=4),},
+                    "factory" : lambda surface: ResolutionController(Plasma(surface, scale=1), fps=fps),},
                 {"start" : 30, "stop" : 40,
-                    "class" : SinusText(surface, "a nice PlasmaFractal Effect", 200, 30, 2, pygame.Color(0,255,255)),},
+                    "factory" : lambda surface: SinusText(surface, "a nice PlasmaFractal Effect", 200, 30, 2, pygame.Color(0,255,255)),},
                 {"start" : 40, "stop": 50,
-                    "class" : PlasmaFractal(surface, scale=4),},
+                    "prepare" : lambda size: {"heightmaps" : (get_heightmap(get_exponent(size, 4)), )},
+                    "factory" : lambda surface, heightmaps: PlasmaFractal(surface, scale=4, animation="cycle", heightmaps=heightmaps),},
                 {"start" : 50, "stop" : 60,
-                    "class" : SinusText(surface, "some sice coffeebean graphics, don't know why its so called, do you?", 200, 30, 2, pygame.Color(0,255,255)),},
+                    "factory" : lambda surface: SinusText(surface, "some sice coffeebean graphics, don't know why its so called, do you?", 200, 30, 2, pygame.Color(0,255,255)),},
                 {"start" : 70, "stop" : 80,
-                    "class" : CoffeeDraw(surface),},
+                    "factory" : lambda surface: CoffeeDraw(surface),},
                 {"start" : 90, "stop" : 100,
-                    "class" : SinusText(surface, "no demo without rotating cubes ...", 200, 20, 2, pygame.Color(0,128,255)),},
+                    "factory" : lambda surface: SinusText(surface, "no demo without rotating cubes ...", 200, 20, 2, pygame.Color(0,128,255)),},
                 {"start" : 90, "stop" : 100,
-                    "class" : SinusText(surface, "no demo without rotating cubes ...", 190, 30, 4, pygame.Color(0,128,255)),},
+                    "factory" : lambda surface: SinusText(surface, "no demo without rotating cubes ...", 190, 30, 4, pygame.Color(0,128,255)),},
                 {"start" : 100, "stop": 110,
-                    "class" :
-                    Mesh(
-                        surface,
-                        origin=(300, 300), 
-                        transformations=
+                    "prepare" : lambda size: {
+                        "transformations" :
                             Utils3d.get_rot_matrix(
                                 Utils3d.get_scale_rot_matrix(
                                     scale_tuple=(600,600,1), 
@@ -50,11 +55,18 @@ def test():
                                     shift_tuple=(0, 0, -10)),
                                 degrees=(1, 2, 3),
                                 steps=360),
-                        polygons = Utils3d.get_cube_polygons())},
+                        "mesh" : Utils3d.get_cube_mesh()},
+                    "factory" : lambda surface, transformations, mesh:
+                    Mesh(
+                        surface,
+                        origin=(300, 300), 
+                        transformations=transformations,
+                        mesh=mesh)},
                 {"start" : 109, "stop" : 120,
-                "class" : SinusText(surface, "greetings to all, who are better demomakers than i", 200, 30, 2, pygame.Color(0,255,255)),},
+                "factory" : lambda surface: SinusText(surface, "greetings to all, who are better demomakers than i", 200, 30, 2, pygame.Color(0,255,255)),},
          
             )
+        sequencer = Sequencer(surface, scenes, preload=5)
         clock = pygame.time.Clock()       
         # mark pause state 
         pause = False
@@ -80,12 +92,11 @@ def test():
             # Update Graphics
             if pause is not True:
                 surface.fill((0, 0, 0, 255))
-                for thing in things:
-                    if thing["start"] < runtime < thing["stop"]:
-                        thing["class"].update()
+                sequencer.update(runtime)
                 pygame.display.update()
                 # pygame.display.flip()
             frames += 1
+        sequencer.close()
         duration = time.time() - starttime
         print "Done %s frames in %s seconds, %s frames/s" % (frames, duration, frames/duration)
     except KeyboardInterrupt:
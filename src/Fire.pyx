@@ -0,0 +1,127 @@
+#!/usr/bin/python
+from __future__ import division
+import pygame
+import numpy as np
+cimport numpy as np
+import RandomStream
+
+
+cdef class Fire(object):
+    """
+    Simulated Fire, 2d effect
+    idea and basic algorithm from
+    http://lodev.org/cgtutor/fire.html
+
+    the whole fire buffer is calculated at once with shifted slices,
+    no python loop over pixels
+    """
+
+    cdef object surface
+    cdef object rect
+    cdef int width
+    cdef int height
+    cdef int scale
+    cdef object drawsurface
+    cdef object blitsurface
+    cdef np.ndarray fire
+    cdef np.ndarray neighbours
+    cdef np.ndarray palette
+    cdef object rng
+
+    def __init__(self, surface, rect, int scale=4, rng=None):
+        """
+        (pygame.surface) surface - to draw on
+        (pygame.Rect) rect - rect to blit fire on
+        (int) scale - scale fire
+        (RandomStream) rng - source of random numbers,
+            stream Fire if not given
+        """
+        self.surface = surface
+        if rng is None:
+            rng = RandomStream.get_stream("Fire")
+        self.rng = rng
+        self.rect = pygame.Rect(rect)
+        # surface in full size to scale into
+        self.blitsurface = pygame.Surface(self.rect.size)
+        self.fire = None
+        self.set_scale(scale)
+        self.initialize()
+
+    cpdef set_scale(self, int scale):
+        """
+        change internal resolution to size of rect / scale,
+        buffers are allocated again and the burning fire
+        is resampled to the new size
+        """
+        cdef np.ndarray old = self.fire
+        self.scale = scale
+        self.width = max(1, self.rect.width // scale)
+        self.height = max(2, self.rect.height // scale)
+        # scaled down surface
+        self.drawsurface = pygame.Surface((self.width, self.height))
+        self.drawsurface.fill((0, 0, 0))
+        # two additional rows below the visible area, these are
+        # read by the lowest visible rows and stay black
+        self.fire = np.zeros((self.width, self.height + 2), dtype=np.uint8)
+        if old is not None:
+            # nearest neighbour of every new pixel in old visible area
+            xs = np.arange(self.width) * (old.shape[0]) // self.width
+            ys = np.arange(self.height) * (old.shape[1] - 2) // self.height
+            self.fire[:, :self.height] = old[xs[:, np.newaxis], ys[np.newaxis, :]]
+        # sum of 4 neighbours is at most 4 * 255 * 16, fits in uint16
+        self.neighbours = np.zeros((self.width, self.height - 1), dtype=np.uint16)
+
+    cpdef int get_scale(self):
+        """return current scaling factor"""
+        return(self.scale)
+
+    cdef initialize(self):
+        """generate palette"""
+        cdef int index
+        # palette should be something from black to yellow red
+        # mapped to pixel format of drawsurface, so it can be written
+        # directly to pixels2d
+        self.palette = np.zeros(256, dtype=np.uint32)
+        for index in range(1, 256):
+            color = pygame.Color(0, 0, 0, 255)
+            # original C Comments
+            # Hue goes from 0 to 85: red to yellow
+            # Saturation is always the maximum: 255
+            # Lightness is 0..100 for x=0..128, and 255 for x=128..255
+            # color = HSLtoRGB(ColorHSL(x / 3, 255, std::min(255, x * 2)));
+            color.hsla = (index, 100, index / 2.55, 10)
+            self.palette[index] = self.drawsurface.map_rgb(color)
+
+    cpdef update(self):
+        """update every frame"""
+        cdef int h = self.height
+        cdef np.ndarray fire = self.fire
+        cdef np.ndarray neighbours = self.neighbours
+        cdef np.ndarray pixel2d
+        # random baseline
+        fire[:, h - 1] = self.rng.randint(0, 256, self.width)
+        # every new point depends on O Points
+        #    N
+        #   OOO
+        #    O
+        # added up as shifted views of the buffer, x wraps around
+        # dtype makes numpy add in uint16, not in uint8 of the inputs
+        np.add(fire[:, 2:h + 1], fire[:, 3:h + 2], out=neighbours, dtype=np.uint16)
+        neighbours[1:] += fire[:-1, 1:h]
+        neighbours[0] += fire[-1, 1:h]
+        neighbours[:-1] += fire[1:, 1:h]
+        neighbours[-1] += fire[0, 1:h]
+        # the last factor 16/65 should be slightly larger than 4
+        # and lesser than 5
+        # closer to 4 will make flames higher
+        neighbours *= 16
+        neighbours //= 65
+        fire[:, :h - 1] = neighbours
+        # map fire values to colors in one pass
+        pixel2d = pygame.surfarray.pixels2d(self.drawsurface)
+        pixel2d[:, :] = self.palette[fire[:, :h]]
+        # release surface lock
+        del pixel2d
+        # scale fire surface up to given size
+        pygame.transform.scale(self.drawsurface, self.rect.size, self.blitsurface)
+        self.surface.blit(self.blitsurface, self.rect)
@@ -2,88 +2,216 @@
 #
 
 import sys
+import time
 import pygame
 import numpy as np
 cimport numpy as np
+cimport cython
+from cython.parallel import prange
+
+
+@cython.cdivision(True)
+cdef inline int escape_time(double cx, double cy, int itermax, double bailout) nogil:
+    """
+    return number of iterations until z escapes, itermax if z stays bounded
+
+    points in the main cardioid and in the period 2 bulb are known to be
+    inside the set and return itermax without iterating,
+    if z runs into a cycle iteration also stops early
+    """
+    cdef double x = cx
+    cdef double y = cy
+    cdef double x2, y2, xx
+    cdef double q = (cx - 0.25) * (cx - 0.25) + cy * cy
+    cdef double betrag = 0.0
+    cdef double x_old = 0.0
+    cdef double y_old = 0.0
+    cdef int iteration = 0
+    cdef int period = 0
+    # main cardioid
+    if q * (q + (cx - 0.25)) <= 0.25 * cy * cy:
+        return(itermax)
+    # period 2 bulb
+    if (cx + 1.0) * (cx + 1.0) + cy * cy <= 0.0625:
+        return(itermax)
+    while (iteration < itermax) and (betrag < bailout):
+        x2 = x * x
+        y2 = y * y
+        betrag = x2 + y2
+        xx = x2 - y2 + cx
+        y = 2.0 * x * y + cy
+        x = xx
+        iteration += 1
+        # periodicity checking, if z returns to an earlier value
+        # it will never escape
+        if x == x_old and y == y_old:
+            return(itermax)
+        period += 1
+        if period == 20:
+            period = 0
+            x_old = x
+            y_old = y
+    return(iteration)
+
 
 cdef class Mandelbrot(object):
-    """Clasical Mandelbrot Function, realy slow on python, so have some patience"""
+    """Clasical Mandelbrot Function, rendered in row bands on all cores"""
 
     cdef object surface
     cdef int width
     cdef int height
+    cdef int itermax
+    cdef int band
+    cdef bint progressive
+    cdef double budget
+    cdef int step
+    cdef int row
+    cdef double left
+    cdef double right
+    cdef double bottom
+    cdef double top
     cdef np.ndarray array2d
+    cdef unsigned int[:, :] pixels
 
-    def __init__(self, surface):
+    def __init__(self, surface, double left=-2.1, double right=0.7, double bottom=-1.2, double top=1.2, int itermax=255, int band=8, bint progressive=False, double budget=0.01):
         """
         (pygame.Surface) surface - surface to draw on
+        (float) left, right, bottom, top - visible part of complex plane
+        (int) itermax - how many iterations to do
+        (int) band - number of rows every thread renders at once
+        (bool) progressive - render in passes of 1/8, 1/4, 1/2 and
+            full resolution spread over calls of update
+        (float) budget - seconds per update to spend in progressive mode
         """
         self.surface = surface
         # set some values
         self.width = self.surface.get_width()
         self.height = self.surface.get_height()
-        self.array2d = pygame.surfarray.array2d(self.surface)
-        self.initialize()
-        print "done" 
+        self.itermax = itermax
+        self.band = band
+        self.progressive = progressive
+        self.budget = budget
+        self.step = 0
+        self.row = 0
+        self.array2d = np.zeros((self.width, self.height), dtype=np.uint32)
+        self.pixels = self.array2d
+        self.set_viewport(left, right, bottom, top)
+        print "done"
 
-    cdef initialize(self, float left=-2.1, float right=0.7, float bottom=-1.2, float top=1.2, int maxiter=30):
+    cpdef set_viewport(self, double left, double right, double bottom, double top):
         """
-        initialize pixelarray with color value,
-        classical approach, really, really slow
+        set visible part of complex plane and render it,
+        in progressive mode rendering starts with next update
         """
-        cdef float x, xx, y, cx, cy, betrag, x2, y2
-        cdef int interation, hx, hy
-        cdef int itermax
-        cdef float magnify
-        cdef float stepy
-        cdef float stepx
-        cdef int color
-        x = xx = y = cx = cy = betrag = x2 = y2 = 0.0
-        iteration = hx = hy = 0
-        itermax = 255		# how many iterations to do
-        magnify=1.0		# no magnification
-        stepy = (top - bottom) / self.height
-        stepx = (right - left) / self.width
-        cy = bottom
-        for hy in xrange(self.height):
-            cx = left
-            for hx in xrange(self.width):
-                x = cx
-                y = cy
-                iteration = 0
-                betrag = 0.0 
-                while (iteration < itermax) and (betrag < maxiter):
-                    x2 = x * x
-                    y2 = y * y
-                    betrag = x2 + y2
-                    xx = x2 - y2 + cx
-                    y = 2.0 * x * y + cy
-                    x = xx
-                    iteration += 1
-                color = (iteration << 16) + (iteration << 8) + iteration
-                # color = pygame.Color(iteration, iteration, iteration)
-                self.array2d[hx][hy] = color
-                cx = cx + stepx
-            cy = cy + stepy
+        self.left = left
+        self.right = right
+        self.bottom = bottom
+        self.top = top
+        if self.progressive:
+            # start over with coarsest pass
+            self.step = 8
+            self.row = 0
+        else:
+            self.initialize()
+
+    cpdef zoom(self, int x, int y, double factor=2.0):
+        """
+        zoom in by factor, centered at pixel position x, y
+        factors lower than 1 zoom out
+        """
+        cdef double cx = self.left + (self.right - self.left) * x / self.width
+        cdef double cy = self.bottom + (self.top - self.bottom) * y / self.height
+        cdef double half_width = (self.right - self.left) / factor / 2
+        cdef double half_height = (self.top - self.bottom) / factor / 2
+        self.set_viewport(cx - half_width, cx + half_width, cy - half_height, cy + half_height)
+
+    cdef initialize(self):
+        """initialize pixelarray with color value, all at once"""
+        self.render_rows(1, 0, self.height, False)
+
+    cdef refine(self):
+        """
+        render the next rows of the current progressive pass,
+        until the time budget of this frame is used up.
+        every pass halves the step, until full resolution is reached
+        """
+        cdef int stop
+        cdef double starttime = time.time()
+        while self.step > 0:
+            stop = min(self.row + self.band * 8 * self.step, self.height)
+            # the coarsest pass has no earlier pass to refine
+            self.render_rows(self.step, self.row, stop, self.step < 8)
+            self.row = stop
+            if self.row >= self.height:
+                self.step //= 2
+                self.row = 0
+            if time.time() - starttime > self.budget:
+                break
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef render_rows(self, int step, int start, int stop, bint refine, double bailout=30.0):
+        """
+        render every step-th pixel of every step-th row from start to stop
+        and fill a block of step x step pixels with its color.
+        if refine is set, pixels already rendered in the pass
+        with 2 * step are skipped.
+        the rows are split into bands of self.band rows,
+        which are rendered in parallel without the gil
+        """
+        cdef int ix, hx, hy, bx, by, iteration, gray
+        cdef unsigned int color
+        cdef int coarse = step * 2
+        cdef int columns = (self.width + step - 1) // step
+        cdef int width = self.width
+        cdef int height = self.height
+        cdef int itermax = self.itermax
+        cdef int band = self.band
+        cdef double left = self.left
+        cdef double bottom = self.bottom
+        cdef double stepx = (self.right - self.left) / self.width
+        cdef double stepy = (self.top - self.bottom) / self.height
+        cdef unsigned int[:, :] pixels = self.pixels
+        for hy in prange(start, stop, step, nogil=True, schedule="dynamic", chunksize=band):
+            for ix in range(columns):
+                hx = ix * step
+                if refine and hx % coarse == 0 and hy % coarse == 0:
+                    continue
+                iteration = escape_time(left + hx * stepx, bottom + hy * stepy, itermax, bailout)
+                # scale iterations to gray 0-255
+                gray = iteration * 255 / itermax
+                color = (gray << 16) + (gray << 8) + gray
+                for by in range(hy, min(hy + step, height)):
+                    for bx in range(hx, min(hx + step, width)):
+                        pixels[bx, by] = color
 
     cpdef update(self):
-        """blit pixelarray to surface"""
+        """refine pending progressive passes, blit pixelarray to surface"""
+        if self.step > 0:
+            self.refine()
         pygame.surfarray.blit_array(self.surface, self.array2d)
 
 def test():
     try:
-        fps = 1
+        fps = 25
         surface = pygame.display.set_mode((800, 600))
         pygame.init()
-        mandelbrot = Mandelbrot(surface)
-        clock = pygame.time.Clock()       
+        mandelbrot = Mandelbrot(surface, itermax=1000, progressive=True)
+        clock = pygame.time.Clock()
         pause = False
         while True:
             clock.tick(fps)
-            events = pygame.event.get()  
-            for event in events:  
-                if event.type == pygame.QUIT:  
+            events = pygame.event.get()
+            for event in events:
+                if event.type == pygame.QUIT:
                     sys.exit(0)
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    # left button zooms in, every other button out
+                    if event.button == 1:
+                        mandelbrot.zoom(event.pos[0], event.pos[1], 2.0)
+                    else:
+                        mandelbrot.zoom(event.pos[0], event.pos[1], 0.5)
             keyinput = pygame.key.get_pressed()
             if keyinput is not None:
                 if keyinput[pygame.K_ESCAPE]:
@@ -98,4 +226,3 @@ def test():
 
 if __name__ == '__main__':
     test()
-
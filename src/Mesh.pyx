@@ -17,23 +17,73 @@ cdef class Mesh(object):
     cdef tuple origin
     cdef int frames
     cdef int len_transformations
-    cdef list transformations
+    cdef object transformations
     cdef list polygons
     cdef np.ndarray shift_vec
+    cdef np.ndarray vertices
+    cdef np.ndarray faces
+    cdef np.ndarray transformed
+    cdef np.ndarray projected
+    cdef double fov
+    cdef double viewer_distance
+    cdef np.ndarray viewer
+    cdef object light
+    cdef bint fill
+    cdef bint cull
+    cdef object color
+    cdef np.ndarray rgb
+    cdef double ambient
 
-    def __init__(self, surface, tuple origin, transformations=None, polygons=None):
+    def __init__(self, surface, tuple origin, transformations=None, polygons=None, tuple mesh=None, double fov=0.8, double viewer_distance=1, bint fill=False, cull=None, color=None, light=None, double ambient=0.2):
         """
         pygame surface to draw on
         center positon of mesh in 2d space
+        mesh is a tuple of unique vertices and face indices,
+        like returned by Utils3d.get_cube_mesh, if not given
+        it is build from polygons
+        fov and viewer_distance are used for perspective projection
+        fill draws shaded filled faces instead of wireframe
+        cull removes faces pointing away from viewer, this needs
+        counter clockwise faces seen from outside, None culls
+        only meshes given as mesh, polygons have no defined winding
+        color of type pygame.Color for faces
+        light is a 3d direction to the light source,
+        None lights the faces along the view axis
+        ambient is the minimum brightness of filled faces
         """
         self.surface = surface
         (self.origin_x, self.origin_y) = origin
         self.frames = 0
+        self.fov = fov
+        self.viewer_distance = viewer_distance
+        # center of perspective projection
+        self.viewer = np.array((0.0, 0.0, -viewer_distance), dtype=np.float64)
+        self.fill = fill
+        if cull is None:
+            cull = mesh is not None
+        self.cull = cull
+        if color is None:
+            color = pygame.Color(200, 200, 200, 255)
+        self.color = color
+        self.rgb = np.array((color.r, color.g, color.b), dtype=np.float64)
+        if light is not None:
+            light = np.asarray(light, dtype=np.float64)[:3]
+            light = light / np.linalg.norm(light)
+        self.light = light
+        self.ambient = ambient
         # initialze list of transformations applied to every face
         self.transformations = transformations
         self.len_transformations = len(transformations)
         # initialize list of polygons for this mesh
         self.polygons = polygons
+        # all unique vertices in one array, faces as indices into it,
+        # so every vertex is transformed and projected once per frame
+        if mesh is None:
+            mesh = Utils3d.get_mesh_from_polygons(polygons)
+        (self.vertices, self.faces) = mesh
+        # buffers reused every frame
+        self.transformed = np.empty_like(self.vertices)
+        self.projected = np.empty((len(self.vertices), 2), dtype=np.float64)
 
     cpdef initialize_points(self):
         """
@@ -49,41 +99,72 @@ cdef class Mesh(object):
         """
         pass
 
+    cpdef project(self):
+        """
+        perspective projection of all transformed vertices to 2d
+        with field of view and viewer distance
+        """
+        cdef np.ndarray factor
+        factor = self.fov / (self.viewer_distance + self.transformed[:, 2])
+        np.multiply(self.transformed[:, 0], factor, out=self.projected[:, 0])
+        np.multiply(self.transformed[:, 1], -factor, out=self.projected[:, 1])
+        self.projected[:, 0] += self.origin_x
+        self.projected[:, 1] += self.origin_y
+
     cpdef update(self):
         """
         called on every frame
-        apply transformation matrix and project every polygon to 2d
-        for color avg_z function is used
-        polygons are sorted on avg_z value
+        apply transformation matrix to all vertices at once
+        and project them to 2d
+        faces pointing away from viewer are culled,
+        for color the angle between face normal and light is used
+        faces are sorted on average distance to viewer
 
         finally painting on surface is called
         """
-        cdef np.ndarray light_positon
-        cdef np.ndarray pos_vec
-        cdef np.ndarray v_light
-        cdef np.ndarray normal
-        cdef double light_angle
-        cdef int normal_color
-        # light from above
-        #light_position = np.array((0.0, 0.0, 10.0, 1.0), dtype=DTYPE)
+        cdef np.ndarray transformation
+        cdef np.ndarray faces
+        cdef np.ndarray v0
+        cdef np.ndarray normals
+        cdef np.ndarray to_viewer
+        cdef np.ndarray depth
+        cdef np.ndarray order
+        cdef np.ndarray shade
+        cdef list faces2d
+        cdef list colors
         # apply linear transformations to vetices
-        # daw faces fom lowe z to higher
         transformation = self.transformations[self.frames % self.len_transformations]
-        color = pygame.Color(200, 200, 200, 255)
-        for polygon in self.polygons:
-            # apply transformation to every vertice in polygon
-            newpolygon = polygon.transform(transformation)
-            # get new position vector
-            #pos_vec = newpolygon.get_position_vector()
-            # calculate vector from face to lightsource
-            #v_light = pos_vec - light_position
-            # get the normal of the face
-            #normal = newpolygon.get_normal_faster()
-            # calculate angle between face normal and vector to light source
-            #light_angle = Utils3d.angle_to(normal, v_light)
-            # angle to light source in radians, between 0 and math.pi
-            #normal_color = int(light_angle * 255 / math.pi)
-            #avg_z = max(min(abs(int(newface.get_avg_z() * 10)), 255), 0) 
-            #color = pygame.Color(normal_color, normal_color, normal_color, 255)
-            pygame.draw.polygon(self.surface, color, newpolygon.projected(self.origin_x, self.origin_y), 1)
+        np.dot(self.vertices, transformation.T, out=self.transformed)
+        self.project()
+        # normals of all faces from the first three vertices
+        faces = self.faces
+        v0 = self.transformed[faces[:, 0], :3]
+        normals = np.cross(self.transformed[faces[:, 1], :3] - v0, self.transformed[faces[:, 2], :3] - v0)
+        to_viewer = self.viewer - v0
+        if self.cull:
+            # visible faces point to the viewer
+            visible = np.flatnonzero(np.einsum("ij,ij->i", normals, to_viewer) > 0)
+            faces = faces[visible]
+            normals = normals[visible]
+            v0 = v0[visible]
+        # daw faces from farthest to nearest
+        depth = np.abs(self.transformed[faces, 2].mean(axis=1) - self.viewer[2])
+        order = np.argsort(depth)[::-1]
+        # one conversion to python lists for all faces
+        faces2d = self.projected[faces[order]].tolist()
+        if self.fill:
+            normals = normals[order]
+            if self.light is None:
+                # light along the view axis, towards the viewer
+                shade = normals[:, 2] * np.sign(self.viewer[2] - v0[order, 2])
+            else:
+                shade = normals.dot(self.light)
+            shade /= np.linalg.norm(normals, axis=1)
+            shade = self.ambient + (1.0 - self.ambient) * np.clip(shade, 0.0, 1.0)
+            colors = np.outer(shade, self.rgb).astype(np.int32).tolist()
+            for face2d, color in zip(faces2d, colors):
+                pygame.draw.polygon(self.surface, color, face2d, 0)
+        else:
+            for face2d in faces2d:
+                pygame.draw.polygon(self.surface, self.color, face2d, 1)
         self.frames += 1
@@ -3,7 +3,6 @@ from __future__ import division
 import pygame
 import math
 import random
-import array
 import numpy as np
 cimport numpy as np
 DTYPE = np.float
@@ -14,64 +13,98 @@ cdef class Plasma(object):
     """Plasma Effect on Surface"""
 
     cdef int tick
+    cdef double scale
     cdef object surface
     cdef object parent
-    cdef object sin
-    cdef object cos
+    cdef np.ndarray sin
+    cdef np.ndarray cos
+    cdef np.ndarray colors
+    cdef np.ndarray x8
+    cdef np.ndarray y8
+    cdef np.ndarray xy8
+    cdef bint cycle
+    cdef object indexsurface
+    cdef np.ndarray cycle_colors
 
-    def __init__(self, surface, scale=1):
+    def __init__(self, surface, scale=1, cycle=False):
         """
         (pygame.Surface) surface - surface to draw on
         (int) scale - scaling factor
+        (bool) cycle - calculate plasma only once as 8 bit color
+            indices and animate by rotating the palette
         """
         # initialize things
         self.tick = 0
+        self.cycle = cycle
         self.parent = surface
-        self.surface = pygame.Surface(surface.get_size())
-        self.surface = pygame.transform.scale(self.surface, (int(self.surface.get_width() / scale), int(self.surface.get_height() / scale)))
         print "using %s arraytype" % pygame.surfarray.get_arraytype()
-        self.sin = array.array("f", [0.0] * 512)
-        self.cos = array.array("f", [0.0] * 512)
+        self.set_scale(scale)
+
+    cpdef set_scale(self, double scale):
+        """
+        change internal resolution to size of parent / scale,
+        surface and phase grids are allocated again, animation goes on
+        """
+        self.scale = scale
+        self.surface = pygame.Surface((max(1, int(self.parent.get_width() / scale)), max(1, int(self.parent.get_height() / scale))))
         self.initialize()
 
+    cpdef double get_scale(self):
+        """return current scaling factor"""
+        return(self.scale)
+
     cdef initialize(self):
-        cdef rad_to_degree = math.pi / 180
-        for degree in range(512):
-            rad = degree * rad_to_degree * 512/360
-            self.sin[degree] = math.sin(rad)
-            self.cos[degree] = math.cos(rad)
+        """precalculate sin table, color table and phase grids"""
+        cdef np.ndarray degrees = np.arange(512)
+        rad = degrees * math.pi / 180 * 512 / 360
+        self.sin = np.sin(rad)
+        self.cos = np.cos(rad)
+        # v is in boundary -4 to +4, so (v + 4) * 64 indexes the whole
+        # sin table, precalculate the red color for every index
+        self.colors = (128 + self.sin * 128).astype(np.uint32) << 16
+        # shift by 3 bits, equals multiplication by 8
+        # x8 is a column, y8 a row, so they broadcast to the full grid
+        self.x8 = (np.arange(self.surface.get_width(), dtype=np.int32) << 3)[:, np.newaxis]
+        self.y8 = (np.arange(self.surface.get_height(), dtype=np.int32) << 3)[np.newaxis, :]
+        self.xy8 = self.x8 + self.y8
+        if self.cycle:
+            self.initialize_cycle()
+
+    cdef initialize_cycle(self):
+        """
+        render the plasma once as palette indices into an 8 bit
+        surface in size of parent, only its palette changes later
+        """
+        # same red wave as colors, two periods over 256 entries,
+        # so the palette can be rotated without a seam
+        red = 128 + 127 * np.sin(np.arange(256) * 4 * math.pi / 256)
+        self.cycle_colors = np.zeros((256, 3), dtype=np.uint8)
+        self.cycle_colors[:, 0] = red.astype(np.uint8)
+        # v is in boundary -3 to +3, (v + 4) * 32 fits into 0-255
+        indices = ((self.field(0) + 4) * 32).astype(np.uint8)
+        indexsurface = pygame.Surface(self.surface.get_size(), 0, 8)
+        pygame.surfarray.blit_array(indexsurface, indices)
+        self.indexsurface = pygame.transform.scale(indexsurface, self.parent.get_size())
+
+    cdef np.ndarray field(self, int t):
+        """whole plasma field at time t, with table lookups on precalculated grids"""
+        cdef np.ndarray v
+        # & 511 makes sure, that the result is in between 0-512
+        v = self.sin[(self.y8 + t) >> 2 & 511] + self.sin[(self.x8 + t) & 511]
+        v += self.sin[(self.xy8 + t) >> 2 & 511]
+        return(v)
 
     cdef calculate(self):
-        """version with math.sin"""
-        cdef int t
-        cdef int xx
-        cdef int yy
-        cdef int y8
-        cdef int x8
-        cdef int index
-        cdef double v
-        cdef double ysin
-        #cdef double rad_to_degree =  math.pi / 180
+        """whole frame at once"""
+        cdef np.ndarray v
         cdef np.ndarray pixel2d
-        t = self.tick
+        v = self.field(self.tick)
         pixel2d = pygame.surfarray.pixels2d(self.surface)
-        for yy in range(self.surface.get_height()):
-            # these two values are the same for every xx
-            y8 = yy << 3
-            ysin = self.sin[(y8 + t) >> 2 & 511]
-            for xx in range(self.surface.get_width()):
-                # shift by 3 bits, equals multiplication by 8
-                x8 = (xx << 3) + t
-                # & 511 makes sure, that the result is in between 0-512
-                v = ysin + self.sin[x8 & 511]
-                v += self.sin[(x8 + y8) >> 2 & 511]
-                # this square root cost about 20 fps
-                #v += self.sin[(int(math.sqrt(100 * (cx * cx + cy * cy) + 1)) + t) & 511]
-                # get to color up your life, calculate hue
-                # v should be in boundary -4 to +4, range of 8
-                # so get to my array type sin, it should be shifted by 4 and scaled by 64
-                index = int((v + 4) * 64)
-                pixel2d[xx, yy] = int(128 + self.sin[index] * 128) << 16
+        # v should be in boundary -4 to +4, range of 8
+        # so get to my array type sin, it should be shifted by 4 and scaled by 64
+        pixel2d[:, :] = self.colors[((v + 4) * 64).astype(np.int32)]
+        # release surface lock
+        del pixel2d
         self.tick += 5
 
     cdef calculate2(self):
@@ -84,8 +117,20 @@ cdef class Plasma(object):
             for xx in range(self.surface.get_width()):
                 pixel2d[xx, yy] = 1 << 24
      
+    cdef rotate(self):
+        """
+        rotate palette of index surface and blit it,
+        cost does not depend on plasma calculation
+        """
+        self.indexsurface.set_palette(np.roll(self.cycle_colors, -self.tick, axis=0).tolist())
+        self.parent.blit(self.indexsurface, (0, 0))
+        self.tick = (self.tick + 2) & 255
+
     cpdef update(self):
         """update every frame"""
+        if self.cycle:
+            self.rotate()
+            return
         self.calculate()
         # scale surface to size of parent surface to fit
         pygame.transform.scale(self.surface, self.parent.get_size(), self.parent)
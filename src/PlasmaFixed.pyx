@@ -0,0 +1,114 @@
+#!/usr/bin/python
+from __future__ import division
+import pygame
+import math
+import numpy as np
+cimport numpy as np
+cimport cython
+
+
+cdef class PlasmaFixed(object):
+    """
+    Plasma Effect on Surface, integer only version
+
+    same picture as Plasma, but sin values are fixed point integers
+    scaled by 64 and the three sin terms are looked up once per row,
+    once per column and once per diagonal on every frame.
+    so the inner loop over all pixels does only integer adds
+    and one lookup in a palette of packed pixel values.
+    needs a 32 bit surface
+    """
+
+    cdef int tick
+    cdef double scale
+    cdef object surface
+    cdef object parent
+    cdef int width
+    cdef int height
+    cdef int[:] sin
+    cdef unsigned int[:] palette
+    cdef int[:] rows
+    cdef int[:] columns
+    cdef int[:] diagonals
+
+    def __init__(self, surface, scale=1):
+        """
+        (pygame.Surface) surface - surface to draw on
+        (int) scale - scaling factor
+        """
+        self.tick = 0
+        self.parent = surface
+        self.set_scale(scale)
+
+    cpdef set_scale(self, double scale):
+        """
+        change internal resolution to size of parent / scale,
+        surface and phase tables are allocated again
+        """
+        self.scale = scale
+        self.width = max(1, int(self.parent.get_width() / scale))
+        self.height = max(1, int(self.parent.get_height() / scale))
+        self.surface = pygame.Surface((self.width, self.height), 0, self.parent)
+        self.initialize()
+
+    cpdef double get_scale(self):
+        """return current scaling factor"""
+        return(self.scale)
+
+    cdef initialize(self):
+        """precalculate fixed point sin table, palette and phase buffers"""
+        cdef int index
+        cdef int red
+        rad = np.arange(512) * math.pi / 180 * 512 / 360
+        # sin * 64, sum of three values is in -192 to +192
+        self.sin = np.round(np.sin(rad) * 64).astype(np.int32)
+        # in Plasma (v + 4) * 64 indexes the 512 entry sin table,
+        # here (sum + 256) / 2 indexes every second entry,
+        # so 256 palette entries are enough
+        self.palette = np.zeros(256, dtype=np.uint32)
+        for index in range(256):
+            red = min(255, int(128 + math.sin(rad[index * 2]) * 128))
+            self.palette[index] = self.surface.map_rgb((red, 0, 0))
+        self.rows = np.zeros(self.height, dtype=np.int32)
+        self.columns = np.zeros(self.width, dtype=np.int32)
+        self.diagonals = np.zeros(self.width + self.height - 1, dtype=np.int32)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef calculate(self):
+        """whole frame with integer adds and palette lookups"""
+        cdef int x, y, row
+        cdef int t = self.tick
+        cdef int width = self.width
+        cdef int height = self.height
+        cdef int[:] sin = self.sin
+        cdef int[:] rows = self.rows
+        cdef int[:] columns = self.columns
+        cdef int[:] diagonals = self.diagonals
+        cdef unsigned int[:] palette = self.palette
+        cdef unsigned int[:, :] pixels
+        # phase of every row, column and diagonal x + y
+        # shift by 3 bits, equals multiplication by 8
+        for y in range(height):
+            rows[y] = sin[((y << 3) + t) >> 2 & 511]
+        for x in range(width):
+            columns[x] = sin[((x << 3) + t) & 511]
+        for x in range(width + height - 1):
+            diagonals[x] = sin[((x << 3) + t) >> 2 & 511]
+        array2d = pygame.surfarray.pixels2d(self.surface)
+        pixels = array2d
+        # surface memory is row by row, so x is the inner loop
+        for y in range(height):
+            row = rows[y] + 256
+            for x in range(width):
+                pixels[x, y] = palette[(row + columns[x] + diagonals[x + y]) >> 1]
+        # release surface lock
+        pixels = None
+        del array2d
+        self.tick += 5
+
+    cpdef update(self):
+        """update every frame"""
+        self.calculate()
+        # scale surface to size of parent surface to fit
+        pygame.transform.scale(self.surface, self.parent.get_size(), self.parent)
@@ -2,32 +2,177 @@
 from __future__ import division
 import pygame
 import math
-import random
-import array
 import numpy as np
 cimport numpy as np
-DTYPE = np.float
-ctypedef np.float_t DTYPE_t
+import RandomStream
+
+
+cpdef np.ndarray get_heightmap(int exponent, double roughness=1.5, bint wrap=False, corners=None, rng=None):
+    """
+    random midpoint displacement with diamond square steps,
+    filled level by level, every level is a few strided array operations
+
+    (int) exponent - heightmap has 2 ** exponent + 1 points per side
+    (float) roughness - random displacement of a point is
+        (random - 0.5) * roughness * cell size / heightmap size
+    (bool) wrap - values outside 0 - 1 wrap around,
+        otherwise they are clipped
+    (tuple) corners - start values of the four corners,
+        random if not given
+    (RandomStream) rng - source of random numbers,
+        stream PlasmaFractal if not given
+
+    returns float32 heightmap with values in 0.0 - 1.0
+    """
+    cdef int size = (1 << exponent) + 1
+    cdef int step = size - 1
+    cdef int half
+    cdef int cells
+    cdef np.ndarray heightmap = np.zeros((size, size), dtype=np.float32)
+    cdef np.ndarray centers
+    cdef np.ndarray total
+    if rng is None:
+        rng = RandomStream.get_stream("PlasmaFractal")
+    if corners is None:
+        corners = rng.random(4)
+    heightmap[0, 0] = corners[0]
+    heightmap[-1, 0] = corners[1]
+    heightmap[-1, -1] = corners[2]
+    heightmap[0, -1] = corners[3]
+    while step > 1:
+        half = step // 2
+        cells = (size - 1) // step
+        amplitude = roughness * step / (size - 1)
+        # square step, center of every cell is the mean of its
+        # four corners plus random displacement
+        centers = heightmap[half::step, half::step]
+        centers[:] = heightmap[:-1:step, :-1:step]
+        centers += heightmap[step::step, :-1:step]
+        centers += heightmap[:-1:step, step::step]
+        centers += heightmap[step::step, step::step]
+        centers *= 0.25
+        centers += (rng.random((cells, cells)) - 0.5) * amplitude
+        limit(centers, wrap)
+        # diamond step, middle of every edge is the mean of its
+        # two corners and the centers on both sides, on the border
+        # there is only one center, so the mean is of three values
+        # edges along x
+        total = heightmap[:-1:step, ::step] + heightmap[step::step, ::step]
+        total[:, 1:] += centers
+        total[:, :-1] += centers
+        total *= 0.25
+        total[:, 0] *= 4.0 / 3.0
+        total[:, -1] *= 4.0 / 3.0
+        total += (rng.random((cells, cells + 1)) - 0.5) * amplitude
+        limit(total, wrap)
+        heightmap[half::step, ::step] = total
+        # edges along y
+        total = heightmap[::step, :-1:step] + heightmap[::step, step::step]
+        total[1:, :] += centers
+        total[:-1, :] += centers
+        total *= 0.25
+        total[0, :] *= 4.0 / 3.0
+        total[-1, :] *= 4.0 / 3.0
+        total += (rng.random((cells + 1, cells)) - 0.5) * amplitude
+        limit(total, wrap)
+        heightmap[::step, half::step] = total
+        step = half
+    return(heightmap)
+
+
+cpdef int get_exponent(tuple size, double scale=1):
+    """exponent of smallest heightmap covering size / scale"""
+    return(max(1, int(math.ceil(math.log(max(size) / scale, 2)))))
+
+
+cdef limit(np.ndarray values, bint wrap):
+    """keep values in 0.0 - 1.0, in place"""
+    if wrap:
+        np.abs(values, out=values)
+        np.mod(values, 1.0, out=values)
+    else:
+        np.clip(values, 0.0, 1.0, out=values)
 
 
 cdef class PlasmaFractal(object):
+    """
+    Plasma Fractal, the whole heightmap is generated with
+    array operations and mapped to colors through a lookup table
+
+    without animation a new fractal is generated every frame,
+    animation cycle rotates the lookup table over one fractal,
+    animation blend fades between two fractals, both generate
+    their fractals only once
+    """
 
     cdef object surface
+    cdef int exponent
+    cdef int levels
+    cdef np.ndarray lut
+    cdef np.ndarray xs
+    cdef np.ndarray ys
+    cdef object rng
+    cdef object animation
+    cdef int period
+    cdef int tick
+    cdef np.ndarray first
+    cdef np.ndarray difference
+    cdef tuple heightmaps
 
-    def __init__(self, surface, scale=1):
+    def __init__(self, surface, scale=1, int levels=1024, rng=None, animation=None, int period=256, heightmaps=None):
         """
         (pygame.Surface) surface - surface to draw on
-        (int) scale - scaling factor
+        (int) scale - scaling factor, heightmap has
+            1 / scale of surface resolution
+        (int) levels - number of entries in color lookup table
+        (RandomStream) rng - source of random numbers,
+            stream PlasmaFractal if not given
+        (str) animation - None, "cycle" or "blend"
+        (int) period - frames for one rotation of the lookup table,
+            or to blend to the second fractal and back
+        (tuple) heightmaps - heightmaps for animation, one for cycle,
+            two for blend, from get_heightmap with exponent of
+            get_exponent, generated if not given
         """
         # initialize things
         self.surface = surface
-        #self.surface = pygame.Surface(surface.get_size())
-        #self.surface = pygame.transform.scale(self.surface, (self.surface.get_width() / scale, self.surface.get_height() / scale))
-        #print "using %s arraytype" % pygame.surfarray.get_arraytype()
+        if rng is None:
+            rng = RandomStream.get_stream("PlasmaFractal")
+        self.rng = rng
+        self.levels = levels
+        if animation not in (None, "cycle", "blend"):
+            raise ValueError("unknown animation %r" % animation)
+        self.animation = animation
+        self.period = period
+        self.tick = 0
+        # smallest heightmap covering the scaled surface
+        self.exponent = get_exponent(surface.get_size(), scale)
+        if heightmaps is None:
+            heightmaps = ()
+            if animation == "cycle":
+                heightmaps = (get_heightmap(self.exponent, rng=rng), )
+            elif animation == "blend":
+                heightmaps = (get_heightmap(self.exponent, rng=rng), get_heightmap(self.exponent, rng=rng))
+        self.heightmaps = tuple(heightmaps)
+        # heightmap point of every pixel column and row
+        self.xs = (np.arange(surface.get_width()) * (1 << self.exponent) // surface.get_width())[:, np.newaxis]
+        self.ys = (np.arange(surface.get_height()) * (1 << self.exponent) // surface.get_height())[np.newaxis, :]
+        self.initialize()
 
-    cdef Displace(self, float num):
-        cdef float maximum = num / (self.surface.get_width() + self.surface.get_height()) * 3
-        return((random.random() - 0.5) * maximum)
+    cdef initialize(self):
+        """precalculate pixel values for all color levels"""
+        cdef int index
+        self.lut = np.zeros(self.levels, dtype=np.uint32)
+        for index in range(self.levels):
+            self.lut[index] = self.surface.map_rgb(self.ComputeColor(index / (self.levels - 1)))
+        # color levels of every pixel, generated once for animations
+        if self.animation == "cycle":
+            self.first = self.get_levels(self.heightmaps[0]).astype(np.int32)
+        elif self.animation == "blend":
+            self.first = self.get_levels(self.heightmaps[0])
+            self.difference = self.get_levels(self.heightmaps[1]) - self.first
+        # levels are all that is needed from now on
+        self.heightmaps = ()
 
     cdef ComputeColor(self, float c):
         cdef float red
@@ -49,49 +194,32 @@ cdef class PlasmaFractal(object):
             blue = (0.5 - c) * 2
         return(pygame.Color(int(red*255), int(green*255), int(blue*255)))
 
+    cdef np.ndarray get_levels(self, np.ndarray heightmap):
+        """float32 color level of every pixel of surface"""
+        return(heightmap[self.xs, self.ys] * (self.levels - 1))
+
+    cdef blit(self, np.ndarray lut, np.ndarray indices):
+        """map color levels to pixels of surface, one lookup per pixel"""
+        cdef np.ndarray pixel2d
+        pixel2d = pygame.surfarray.pixels2d(self.surface)
+        pixel2d[:, :] = lut[indices]
+        # release surface lock
+        del pixel2d
+
+    cpdef draw(self, np.ndarray heightmap):
+        """map heightmap to colors of surface"""
+        self.blit(self.lut, self.get_levels(heightmap).astype(np.int32))
+
     cpdef update(self):
-            """
-            This is something of a helper function to create an initial grid
-            before the recursive function is called.
-            """
-            cdef float c1, c2, c3, c4
-            #Assign the four corners of the intial grid random color values
-            #These will end up being the colors of the four corners of the applet.
-            c1 = random.random()
-            c2 = random.random()
-            c3 = random.random()
-            c4 = random.random()
-            self.DivideGrid(0, 0, self.surface.get_width(), self.surface.get_height(), c1, c2, c3, c4)
-
-    cdef DivideGrid(self, float x, float y, float width, float height, float c1, float c2, float c3, float c4):
-        """
-        This is the recursive function that implements the random midpoint
-        //displacement algorithm. It will call itself until the grid pieces
-        //become smaller than one pixel.
-        """
-        cdef float Edge1, Edge2, Edge3, Edge4, Middle
-        cdef float newWidth = width / 2
-        cdef float newHeight = height / 2
-        cdef float c
-
-        if width > 2 or height > 2:
-            Middle = (c1 + c2 + c3 + c4) / 4 + self.Displace(newWidth + newHeight)  #Randomly displace the midpoint!
-            Edge1 = (c1 + c2) / 2  #Calculate the edges by averaging the two corners of each edge.
-            Edge2 = (c2 + c3) / 2
-            Edge3 = (c3 + c4) / 2
-            Edge4 = (c4 + c1) / 2
-
-            #Make sure that the midpoint doesn't accidentally "randomly displaced" past the boundaries!
-            if Middle < 0:
-                Middle = 0
-            elif Middle > 1.0:
-                Middle = 1.0
-            #Do the operation over again for each of the four new grids.
-            self.DivideGrid(x, y, newWidth, newHeight, c1, Edge1, Middle, Edge4)
-            self.DivideGrid(x + newWidth, y, newWidth, newHeight, Edge1, c2, Edge2, Middle)
-            self.DivideGrid(x + newWidth, y + newHeight, newWidth, newHeight, Middle, Edge2, c3, Edge3)
-            self.DivideGrid(x, y + newHeight, newWidth, newHeight, Edge4, Middle, Edge3, c4)
-        else:    #This is the "base case," where each grid piece is less than the size of a pixel.
-            #The four corners of the grid piece will be averaged and drawn as a single pixel.
-            c = (c1 + c2 + c3 + c4) / 4
-            self.surface.set_at((int(x), int(y)), self.ComputeColor(c)) #Java doesn't have a function to draw a single pixel, so
+        """draw next frame"""
+        cdef double weight
+        if self.animation == "cycle":
+            # ComputeColor starts and ends with the same color,
+            # so the table can be rotated without a seam
+            self.blit(np.roll(self.lut, -(self.tick * self.levels // self.period)), self.first)
+        elif self.animation == "blend":
+            weight = (1.0 - math.cos(2 * math.pi * self.tick / self.period)) / 2
+            self.blit(self.lut, (self.first + self.difference * weight).astype(np.int32))
+        else:
+            self.draw(get_heightmap(self.exponent, rng=self.rng))
+        self.tick = (self.tick + 1) % self.period
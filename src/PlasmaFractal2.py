@@ -3,65 +3,51 @@
 
 import sys
 import pygame
-import random
 import math
+import numpy
+from PlasmaFractal import get_heightmap
+import RandomStream
 
 class PlasmaFractal2(object):
     """Plasma Generator"""
 
-    def __init__(self, surface):
+    def __init__(self, surface, rng=None):
         """
         (pygame.Surface) surface - surface to draw on
+        (RandomStream) rng - source of random numbers,
+            stream PlasmaFractal2 if not given
         """
         self.surface = surface
+        if rng is None:
+            rng = RandomStream.get_stream("PlasmaFractal2")
+        self.rng = rng
         # set some values
         self.width = self.surface.get_width()
         self.height = self.surface.get_height()
-        self.roughness = random.randint(2, 5)
-        self.data = [[0 for y in range(self.height)] for x in range(self.width)]
-        self.array2d = pygame.surfarray.array2d(self.surface)
+        self.roughness = self.rng.randint(2, 6)
+        self.data = None
+        self.array2d = None
         self.initialize()
         print "done" 
 
-    def adjust(self, xa, ya, x, y, xb, yb):
-        if (self.data[x][y] == 0):
-          d = math.fabs(xa - xb) + math.fabs(ya - yb)
-          v = (self.data[xa][ya] + self.data[xb][yb]) / 2.0 \
-             + (random.random() - 0.5) * d * self.roughness
-          c = int(math.fabs(v) % 256)
-          self.data[x][y] = c
-
-    def subdivide(self, x1, y1, x2, y2):
-        if (not ((x2 - x1 < 2.0) and (y2 - y1 < 2.0))):
-            x = int((x1 + x2) / 2.0)
-            y = int((y1 + y2) / 2.0)
-            self.adjust(x1, y1, x, y1, x2, y1)
-            self.adjust(x2, y1, x2, y, x2, y2)
-            self.adjust(x1, y2, x, y2, x2, y2)
-            self.adjust(x1, y1, x1, y, x1, y2)
-            if(self.data[x][y] == 0):
-                v = int((self.data[x1][y1] + self.data[x2][y1]) \
-                   + self.data[x2][y2] + self.data[x1][y2]) / 4.0
-                self.data[x][y] = v
-            self.subdivide(x1, y1, x, y)
-            self.subdivide(x, y1, x2, y)
-            self.subdivide(x, y, x2, y2)
-            self.subdivide(x1, y, x, y2)
-
     def initialize(self):
-        ## {{{ http://code.activestate.com/recipes/577113/ (r1)
-        # plasma.py
-        # plasma fractal
-        # FB - 201003147
-        self.data[0][0] = random.randint(0, 255)
-        self.data[self.width - 1][0] = random.randint(0, 255)
-        self.data[self.width - 1][self.height - 1] = random.randint(0, 255)
-        self.data[0][self.height - 1] = random.randint(0, 255)
-        self.subdivide(0, 0, self.width - 1, self.height - 1)
-        for y in range(self.height):
-            for x in range(self.width):
-                self.array2d[x][y] = pygame.Color(0, int(self.data[x][y]), 100)
-        ## end of http://code.activestate.com/recipes/577113/ }}}
+        """
+        plasma fractal like in
+        http://code.activestate.com/recipes/577113/
+        generated with get_heightmap of PlasmaFractal
+        """
+        exponent = max(1, int(math.ceil(math.log(max(self.width, self.height) - 1, 2))))
+        size = 1 << exponent
+        # values wrap around at 256 like in the recipe, displacement
+        # is scaled from values 0 - 255 to heightmap values 0.0 - 1.0
+        heightmap = get_heightmap(exponent, self.roughness * size / 256.0, wrap=True, rng=self.rng)
+        # heightmap point of every pixel, corners on corners
+        xs = numpy.arange(self.width) * size // max(1, self.width - 1)
+        ys = numpy.arange(self.height) * size // max(1, self.height - 1)
+        self.data = (heightmap[xs[:, numpy.newaxis], ys[numpy.newaxis, :]] * 255).astype(numpy.uint8)
+        # pixel value of every green level
+        palette = numpy.array([self.surface.map_rgb((0, green, 100)) for green in range(256)], dtype=numpy.uint32)
+        self.array2d = palette[self.data]
 
     def update(self):
         """blit pixelarray to surface"""
@@ -19,16 +19,26 @@ class PlasmaPy(object):
         (int) scale - scaling factor
         """
         self.parent_surface = surface
-        self.scale = scale
         # initialize things
         self.tick = 0
         self.upsize = surface.get_size()
         self.parent = surface
-        self.surface = pygame.Surface(self.upsize)
-        self.surface = pygame.transform.scale(self.surface, (self.surface.get_width() / scale, self.surface.get_height() / scale))
+        self.set_scale(scale)
+
+    def set_scale(self, scale):
+        """
+        change internal resolution to size of parent / scale,
+        surface, array and precalculated values are build again
+        """
+        self.scale = scale
+        self.surface = pygame.Surface((int(self.upsize[0] / scale), int(self.upsize[1] / scale)))
         self.array2d = pygame.surfarray.array2d(self.surface)
         self.initialize()
 
+    def get_scale(self):
+        """return current scaling factor"""
+        return(self.scale)
+
     def initialize(self):
         """initialize values"""
         max_x = self.surface.get_width()
@@ -3,9 +3,19 @@
 import pygame
 import sys
 import math
+import numpy as np
+import FontCache
 
 class SinusText(object):
-    """Sinus wave scroll text"""
+    """
+    Sinus wave scroll text
+
+    every pixel column of the text is shifted by a sinus offset,
+    which only depends on the column on screen.
+    so the rows to read for every visible column are precalculated,
+    on every frame all visible columns are gathered with one numpy
+    index into a band surface, which is blitted once
+    """
 
     def __init__(self, surface, text, hpos, amplitude, frequency, color, size=30):
         """
@@ -26,19 +36,48 @@ class SinusText(object):
         self.frequency = frequency
         self.color = color
         self.size = size
-        # initialize
-        self.font = None
-        self.text_surface = None
-        self.initialize()
         # position in rendered string
         self.position = 0
         # radian to degree
         self.factor = 2 * math.pi / self.surface.get_width()
+        # initialize
+        self.font = None
+        self.text_surface = None
+        self.text2d = None
+        self.columns = None
+        self.sinus = None
+        self.rows = None
+        self.rows_hpos = None
+        self.margin = None
+        self.band = None
+        self.initialize()
 
     def initialize(self):
-        """generate initial position"""
-        self.font = pygame.font.SysFont("mono", self.size, bold=True)
-        self.text_surface = self.font.render(self.text, True, self.color)
+        """render text and precalculate rows of all visible columns"""
+        self.font = FontCache.get_font("mono", self.size, True)
+        self.text_surface = FontCache.render("mono", self.size, True, self.text, self.color)
+        (text_width, text_height) = self.text_surface.get_size()
+        width = self.surface.get_width()
+        # text pixels with one transparent column and row at the end,
+        # every index outside of the text points there
+        self.text2d = np.zeros((text_width + 1, text_height + 1), dtype=np.uint32)
+        self.text2d[:text_width, :text_height] = pygame.surfarray.array2d(self.text_surface)
+        # sinus offset of every column on screen, the band has room
+        # for the text plus margin above and below
+        self.margin = int(math.ceil(abs(self.amplitude)))
+        self.columns = np.arange(width)
+        self.sinus = np.sin(self.columns * self.frequency * self.factor) * self.amplitude
+        self.band = pygame.Surface((width, text_height + 2 * self.margin), self.text_surface.get_flags(), self.text_surface)
+        self.set_rows(self.hpos)
+
+    def set_rows(self, hpos):
+        """text row of every pixel in band, for band at hpos"""
+        text_height = self.text_surface.get_height()
+        # same rounding as blit at hpos + sinus offset
+        shift = np.floor(hpos + self.sinus).astype(np.intp) - hpos + self.margin
+        self.rows = np.arange(text_height + 2 * self.margin)[np.newaxis, :] - shift[:, np.newaxis]
+        self.rows[(self.rows < 0) | (self.rows >= text_height)] = text_height
+        self.rows_hpos = hpos
 
     def update(self, hpos=None):
         """
@@ -47,12 +86,15 @@ class SinusText(object):
         """
         if hpos is not None:
             self.hpos = hpos
-        for offset in range(self.text_surface.get_width()):
-            self.surface.blit( \
-                self.text_surface, \
-                (0 + offset, self.hpos + math.sin(offset * self.frequency * self.factor) * self.amplitude), \
-                (self.position + offset, 0, 1, self.size) \
-            )
+        if self.hpos != self.rows_hpos:
+            self.set_rows(self.hpos)
+        # text column of every screen column, behind the text transparent
+        columns = np.minimum(self.columns + self.position, self.text_surface.get_width())
+        pixel2d = pygame.surfarray.pixels2d(self.band)
+        pixel2d[:, :] = self.text2d[columns[:, np.newaxis], self.rows]
+        # release surface lock
+        del pixel2d
+        self.surface.blit(self.band, (0, self.hpos - self.margin))
         if self.position < self.text_surface.get_width():
             self.position += 2
         else:
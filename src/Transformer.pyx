@@ -0,0 +1,17 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+import Utils3d
+
+cpdef flying_cubes_t(int x, int y):
+    """
+    transformation table for the cube at grid position x, y
+    in flying_cubes.py, cubes with the same rotation share one table
+    """
+    return(Utils3d.get_rot_matrix_table(
+        Utils3d.get_scale_rot_matrix(
+            scale_tuple=(100, 100, 1),
+            aspect_tuple=(16, 9),
+            shift_tuple=(0, 0, -10)),
+        degrees=((x - y + 20) // 50, (y - x + 40) // 50, 3),
+        steps=360))
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 import math
+from collections import OrderedDict
 import numpy as np
 cimport numpy as np
 DTYPE = np.float64
@@ -182,7 +183,7 @@ cpdef list get_pyramid_polygons():
     face = face.dot(get_rot_x_matrix(-math.pi/4))
     face = face.dot(get_rot_y_matrix(math.pi/2))
     face = face.dot(get_shift_matrix(-1, 0, 0))
-    polygons.append(face)
+    polygons.append(Polygon(face))
     return(polygons)
 
 cpdef list get_cube_polygons():
@@ -209,6 +210,78 @@ cpdef list get_cube_polygons():
     polygons.append(rec.transform(t))
     return(polygons)
 
+cpdef tuple get_cube_mesh():
+    """
+    indexed cube mesh, 8 unique vertices and 6 faces of 4 vertex indices
+    vertices of every face are counter clockwise seen from outside,
+    so the face normal points outward
+    """
+    cdef np.ndarray vertices = np.array([
+        (-1, -1, -1, 1),
+        ( 1, -1, -1, 1),
+        (-1,  1, -1, 1),
+        ( 1,  1, -1, 1),
+        (-1, -1,  1, 1),
+        ( 1, -1,  1, 1),
+        (-1,  1,  1, 1),
+        ( 1,  1,  1, 1),
+        ], dtype=DTYPE)
+    cdef np.ndarray faces = np.array([
+        (0, 2, 3, 1), # back
+        (4, 5, 7, 6), # front
+        (0, 4, 6, 2), # left
+        (1, 3, 7, 5), # right
+        (0, 1, 5, 4), # bottom
+        (2, 6, 7, 3), # top
+        ], dtype=np.intp)
+    return((vertices, faces))
+
+cpdef tuple get_pyramid_mesh():
+    """
+    indexed pyramid mesh with square base, 5 unique vertices and
+    6 triangles, the base is split in two triangles
+    vertices of every face are counter clockwise seen from outside
+    """
+    cdef np.ndarray vertices = np.array([
+        (-1, -1, -1, 1),
+        ( 1, -1, -1, 1),
+        ( 1, -1,  1, 1),
+        (-1, -1,  1, 1),
+        ( 0,  1,  0, 1),
+        ], dtype=DTYPE)
+    cdef np.ndarray faces = np.array([
+        (3, 2, 4), # front
+        (2, 1, 4), # right
+        (1, 0, 4), # back
+        (0, 3, 4), # left
+        (0, 1, 2), # bottom
+        (0, 2, 3),
+        ], dtype=np.intp)
+    return((vertices, faces))
+
+cpdef tuple get_mesh_from_polygons(list polygons):
+    """
+    convert list of polygons to indexed mesh
+    vertices shared between polygons are stored only once,
+    a closing vertex equal to the first one is dropped.
+    returns (n, 4) array of unique vertices and (faces, k) array
+    of vertex indices, every polygon has to have the same number k
+    of vertices
+    """
+    cdef list faces_vertices = []
+    cdef np.ndarray vertices
+    cdef np.ndarray inverse
+    for polygon in polygons:
+        face = polygon.get_vertices()
+        if len(face) > 1 and np.allclose(face[0], face[-1]):
+            face = face[:-1]
+        faces_vertices.append(face)
+    vertices = np.concatenate(faces_vertices).astype(DTYPE)
+    # rounding makes vertices, which differ only by floating point
+    # noise from different transformations, equal
+    (vertices, inverse) = np.unique(np.round(vertices, 9), axis=0, return_inverse=True)
+    return((np.ascontiguousarray(vertices), inverse.reshape(len(polygons), -1)))
+
 cpdef np.ndarray get_scale_rot_matrix(scale_tuple, aspect_tuple, shift_tuple):
     """
     create a affinde transformation matrix
@@ -237,36 +310,136 @@ cpdef np.ndarray get_scale_rot_matrix(scale_tuple, aspect_tuple, shift_tuple):
     cdef np.ndarray static_transformation = shift_matrix.dot(alt_basis_inv.dot(scale_matrix))
     return(static_transformation)
 
-cpdef list get_rot_matrix(static_transformation, tuple degrees, int steps):
+cpdef np.ndarray get_rot_matrices(np.ndarray static_transformation, tuple degrees, np.ndarray steps):
     """
-    static_transformation of type Matrix3d, will be applied to every step
+    return (len(steps), 4, 4) array of transformation matrices
+    static_transformation of type np.ndarray, will be applied to every step
+    degrees of type tuple, for every axis one entry in degrees
+    steps of type np.ndarray, step numbers, angles are step * degrees
+
+    sin and cos of all angles are calculated at once, and
+    rot_z.dot(rot_x.dot(rot_y)) is written out element by element
+    |cz*cy+sz*sx*sy  -sz*cx  cz*sy-sz*sx*cy  0|
+    |sz*cy-cz*sx*sy   cz*cx  sz*sy+cz*sx*cy  0|
+    |        -cx*sy     -sx           cx*cy  0|
+    |             0       0               0  1|
+    """
+    cdef np.ndarray angles = np.outer(np.asarray(degrees, dtype=DTYPE), steps * (math.pi / 180))
+    cdef np.ndarray sin = np.sin(angles)
+    cdef np.ndarray cos = np.cos(angles)
+    cdef np.ndarray rotations = np.zeros((len(steps), 4, 4), dtype=DTYPE)
+    (sx, sy, sz) = sin
+    (cx, cy, cz) = cos
+    sx_sy = sx * sy
+    sx_cy = sx * cy
+    rotations[:, 0, 0] = cz * cy + sz * sx_sy
+    rotations[:, 0, 1] = -sz * cx
+    rotations[:, 0, 2] = cz * sy - sz * sx_cy
+    rotations[:, 1, 0] = sz * cy - cz * sx_sy
+    rotations[:, 1, 1] = cz * cx
+    rotations[:, 1, 2] = sz * sy + cz * sx_cy
+    rotations[:, 2, 0] = -cx * sy
+    rotations[:, 2, 1] = -sx
+    rotations[:, 2, 2] = cx * cy
+    rotations[:, 3, 3] = 1.0
+    # combine with static part of transformation,
+    # which does scaling, shifting and aspect ration correction
+    # to get affine transformation matrix
+    return(np.matmul(static_transformation, rotations))
+
+cpdef np.ndarray get_rot_matrix(static_transformation, tuple degrees, int steps):
+    """
+    static_transformation of type np.ndarray, will be applied to every step
     degrees of type tuple, for every axis one entry in degrees
     steps of type int, how many steps to precalculate
+    returns (steps, 4, 4) array of transformation matrices
     """
-    cdef double angle_x
-    cdef double angle_y
-    cdef double angle_z
-    cdef int step
-    cdef double deg2rad = math.pi / 180
-    cdef double factor
-    cdef np.ndarray transformation
-    cdef list transformations
-    transformations = []
-    for step in range(steps):
-        factor = step * deg2rad
-        angle_x = degrees[0] * factor
-        angle_y = degrees[1] * factor
-        angle_z = degrees[2] * factor
-        # this part of tranformation is calculate for every step
-        transformation = get_rot_z_matrix(angle_z).dot(
-                get_rot_x_matrix(angle_x).dot(
-                    get_rot_y_matrix(angle_y)))
-        # combine with static part of transformation,
-        # which does scaling, shifting and aspect ration correction
-        # to get affine transformation matrix
-        transformation = static_transformation.dot(transformation)
-        transformations.append(transformation)
-    return(transformations)
+    return(get_rot_matrices(np.asarray(static_transformation, dtype=DTYPE), degrees, np.arange(steps)))
+
+
+cdef class TransformationTable(object):
+    """
+    (steps, 4, 4) array of transformation matrices like get_rot_matrix,
+    but every step is calculated on first access
+    """
+
+    cdef public np.ndarray matrices
+    cdef np.ndarray done
+    cdef np.ndarray static_transformation
+    cdef tuple degrees
+    cdef int steps
+
+    def __init__(self, np.ndarray static_transformation, tuple degrees, int steps):
+        """
+        static_transformation of type np.ndarray, will be applied to every step
+        degrees of type tuple, for every axis one entry in degrees
+        steps of type int, number of animation steps
+        """
+        self.static_transformation = static_transformation.astype(DTYPE)
+        self.degrees = degrees
+        self.steps = steps
+        self.matrices = np.empty((steps, 4, 4), dtype=DTYPE)
+        self.done = np.zeros(steps, dtype=np.bool_)
+
+    def __len__(self):
+        return(self.steps)
+
+    def __getitem__(self, int step):
+        if not self.done[step]:
+            self.matrices[step] = get_rot_matrices(self.static_transformation, self.degrees, np.array((step, )))[0]
+            self.done[step] = True
+        return(self.matrices[step])
+
+    cpdef np.ndarray fill(self):
+        """calculate all missing steps and return the whole array"""
+        cdef np.ndarray missing = np.flatnonzero(~self.done)
+        if len(missing) > 0:
+            self.matrices[missing] = get_rot_matrices(self.static_transformation, self.degrees, missing)
+            self.done[:] = True
+        return(self.matrices)
+
+    property nbytes:
+        def __get__(self):
+            return(self.matrices.nbytes)
+
+
+# transformation tables shared between all meshes with the same parameters,
+# least recently used tables are evicted if the limit in bytes is reached
+rot_matrix_cache = OrderedDict()
+rot_matrix_cache_limit = 32 * 1024 * 1024
+
+cpdef set_rot_matrix_cache_limit(int limit):
+    """set maximum size of rotation matrix cache in bytes"""
+    global rot_matrix_cache_limit
+    rot_matrix_cache_limit = limit
+    evict_rot_matrix_cache()
+
+cpdef evict_rot_matrix_cache():
+    """drop least recently used tables until cache fits in limit"""
+    cdef long nbytes = 0
+    for table in rot_matrix_cache.values():
+        nbytes += table.nbytes
+    while nbytes > rot_matrix_cache_limit and len(rot_matrix_cache) > 0:
+        (_, table) = rot_matrix_cache.popitem(last=False)
+        nbytes -= table.nbytes
+
+cpdef TransformationTable get_rot_matrix_table(np.ndarray static_transformation, tuple degrees, int steps, bint lazy=True):
+    """
+    cached version of get_rot_matrix,
+    meshes with the same parameters share one TransformationTable
+    if lazy is False, all steps are calculated at once,
+    otherwise every step on first use
+    """
+    key = (static_transformation.tobytes(), degrees, steps)
+    table = rot_matrix_cache.pop(key, None)
+    if table is None:
+        table = TransformationTable(static_transformation, degrees, steps)
+    if not lazy:
+        table.fill()
+    # most recently used at the end
+    rot_matrix_cache[key] = table
+    evict_rot_matrix_cache()
+    return(table)
 
 cpdef np.ndarray normalized(np.ndarray vector):
     """